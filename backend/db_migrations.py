@@ -1919,6 +1919,13 @@ MIGRATIONS = [
             "ALTER TABLE hr_users ADD COLUMN IF NOT EXISTS welcome_sent_at TIMESTAMP NULL",
         ],
     },
+    {
+        "version": "076_content_queue_posted_created_idx",
+        "statements": [
+            """CREATE INDEX IF NOT EXISTS idx_content_queue_posted_created
+               ON content_queue (created_at) WHERE status = 'posted'""",
+        ],
+    },
 ]
 
 
@@ -9,6 +9,7 @@ from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime, timedelta
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import threading
 import os
@@ -1621,7 +1622,7 @@ async def monitor_all_api_services():
     Returns health status, quotas, and expiration info
     """
     try:
-        results = api_token_monitor.check_all_services()
+        results = await asyncio.to_thread(api_token_monitor.check_all_services)
         return results
     except Exception as e:
         logger.error(f"API monitoring error: {str(e)}")
@@ -1631,7 +1632,7 @@ async def monitor_all_api_services():
 async def monitor_anthropic():
     """Check Claude/Anthropic API status"""
     try:
-        result = api_token_monitor.check_anthropic_api()
+        result = await asyncio.to_thread(api_token_monitor.check_anthropic_api)
         return result
     except Exception as e:
         logger.error(f"Anthropic monitoring error: {str(e)}")
@@ -1641,12 +1642,17 @@ async def monitor_anthropic():
 async def monitor_openai():
     """Check OpenAI/DALL-E API status"""
     try:
-        result = api_token_monitor.check_openai_api()
+        result = await asyncio.to_thread(api_token_monitor.check_openai_api)
         return result
     except Exception as e:
         logger.error(f"OpenAI monitoring error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/monitor/metrics")
+async def monitor_metrics():
+    """Health-check cache hit rate and probe latency per service"""
+    return api_token_monitor.get_metrics()
+
 @app.post("/api/monitor/test-alerts")
 async def test_monitoring_alerts():
     """
@@ -1654,10 +1660,10 @@ async def test_monitoring_alerts():
     Useful for testing notification system
     """
     try:
-        results = api_token_monitor.check_all_services()
+        results = await asyncio.to_thread(api_token_monitor.check_all_services, force_refresh=True)
         
         if not results.get('warnings') and not results.get('errors'):
-            api_token_monitor.send_success_notification(results)
+            await asyncio.to_thread(api_token_monitor.send_success_notification, results)
         
         return {
             "status": "success",
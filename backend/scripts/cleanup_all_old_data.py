@@ -23,7 +23,9 @@ def cleanup_all():
     print(f"📊 Current total: {stats['total_vector_count']} vectors")
     print(f"📊 Namespace: {stats['namespaces']}\n")
     
-    to_delete = []
+    # Insertion-ordered dedup: a Best Brands chunk that mentions GREENDAY is
+    # matched by both parts, and a stable order keeps re-runs comparable.
+    to_delete = {}
     
     print("="*60)
     print("PART 1: GREENDAY Cleanup")
@@ -51,7 +53,7 @@ def cleanup_all():
                 print(f"✅ KEEP: {vector_id[:60]}")
             else:
                 greenday_old.append(vector_id)
-                to_delete.append(vector_id)
+                to_delete[vector_id] = None
                 print(f"❌ DELETE: {vector_id[:60]}")
     
     print(f"\nGREENDAY Summary:")
@@ -90,7 +92,7 @@ def cleanup_all():
         
         print(f"\n❌ Deleting {len(bb_chunks) - 3} excessive Best Brands chunks")
         for chunk in bb_chunks[3:]:
-            to_delete.append(chunk['id'])
+            to_delete[chunk['id']] = None
             print(f"   DELETE: {chunk['id'][:60]}")
     
     print("\n" + "="*60)
@@ -105,6 +107,7 @@ def cleanup_all():
         confirm = input("Proceed? (yes/no): ")
         
         if confirm.lower() == 'yes':
+            to_delete = list(to_delete)
             batch_size = 100
             for i in range(0, len(to_delete), batch_size):
                 batch = to_delete[i:i+batch_size]
@@ -7,7 +7,6 @@ import sys
 sys.path.insert(0, '/home/runner/workspace/backend')
 
 from pinecone import Pinecone
-from services.rag_utils import get_embedding
 
 def cleanup_old_greenday():
     """Delete old GREENDAY_PRODUCT_MANUAL vectors"""
@@ -24,21 +23,10 @@ def cleanup_old_greenday():
     
     print("🔍 Finding old GREENDAY manual vectors...\n")
     
-    query_vector = get_embedding("GREENDAY vodka products")
-    
-    results = index.query(
-        vector=query_vector,
-        top_k=100,
-        namespace="company_knowledge",
-        include_metadata=True
-    )
-    
     to_delete = []
     
-    for match in results['matches']:
-        vector_id = match['id']
-        
-        if 'GREENDAY_PRODUCT_MANUAL' in vector_id:
+    for id_page in index.list(prefix="GREENDAY_PRODUCT_MANUAL", namespace="company_knowledge"):
+        for vector_id in id_page:
             to_delete.append(vector_id)
             print(f"❌ Will delete: {vector_id}")
     
@@ -49,7 +37,9 @@ def cleanup_old_greenday():
         confirm = input(f"\nDelete {len(to_delete)} vectors? (yes/no): ")
         
         if confirm.lower() == 'yes':
-            index.delete(ids=to_delete, namespace="company_knowledge")
+            batch_size = 1000
+            for i in range(0, len(to_delete), batch_size):
+                index.delete(ids=to_delete[i:i+batch_size], namespace="company_knowledge")
             
             print(f"\n✅ Deleted {len(to_delete)} old GREENDAY vectors!")
             print(f"🎯 Now run manual_product_ingest.py to add new vectors with ORGANIC!")
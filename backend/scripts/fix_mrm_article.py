@@ -10,12 +10,14 @@ Usage: python scripts/fix_mrm_article.py
 
 import os
 import sys
+import io
 import re
 import argparse
+from typing import Optional
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, update
 from sqlalchemy.orm import sessionmaker
 from models.content import ContentQueue
 
@@ -32,6 +34,21 @@ PHOTO_CREDIT_PATTERNS = [
     r'^[A-Z][a-z]+\s+[Pp]hoto(?:s)?\s+by\s+.*$',
 ]
 
+# Every credit pattern contains one of these literals, so lines without any
+# of them can skip the regex walk entirely.
+PHOTO_CREDIT_ANCHORS = ("photo", "image", "credit", "courtesy")
+
+PHOTO_CREDIT_RE = re.compile(
+    '|'.join(f'(?:{pattern})' for pattern in PHOTO_CREDIT_PATTERNS),
+    re.IGNORECASE,
+)
+
+# Inline credits glued to the end or start of a real paragraph.
+PHOTO_BY_SUFFIX_RE = re.compile(r',?\s*[Pp]hoto(?:s)?\s+by\s+[A-Za-z\s\.\-\']{3,40}$')
+PHOTO_BY_PREFIX_RE = re.compile(r'^[Pp]hoto(?:s)?\s+by\s+[A-Za-z\s\.\-\']{3,40},?\s*')
+
+EXCESS_NEWLINES_RE = re.compile(r'\n{4,}')
+
 KNOWN_SUBTITLES = [
     "Постійне прагнення до зручності",
     "Досвід як перевага ресторанів майбутнього",
@@ -50,66 +67,58 @@ def clean_article_content(text: str) -> str:
     if not text:
         return text
     
-    lines = text.split('\n')
-    cleaned_lines = []
     removed_count = 0
     
-    for line in lines:
-        line_stripped = line.strip()
-        
-        if not line_stripped:
-            cleaned_lines.append(line)
-            continue
+    def _cleaned_lines():
+        nonlocal removed_count
         
-        is_photo_credit = False
-        for pattern in PHOTO_CREDIT_PATTERNS:
-            if re.match(pattern, line_stripped, re.IGNORECASE):
-                is_photo_credit = True
+        for raw_line in io.StringIO(text):
+            line = raw_line[:-1] if raw_line.endswith('\n') else raw_line
+            line_stripped = line.strip()
+            
+            if not line_stripped:
+                yield line
+                continue
+            
+            line_lower = line_stripped.lower()
+            is_candidate = any(anchor in line_lower for anchor in PHOTO_CREDIT_ANCHORS)
+            
+            if is_candidate and PHOTO_CREDIT_RE.match(line_stripped):
                 print(f"  🗑️  Removed photo credit: '{line_stripped}'")
                 removed_count += 1
-                break
-        
-        if is_photo_credit:
-            continue
-        
-        if re.search(r'[Pp]hoto(?:s)?\s+by\s+[A-Za-z\s\.\-\']{3,40}$', line_stripped):
-            clean_line = re.sub(r',?\s*[Pp]hoto(?:s)?\s+by\s+[A-Za-z\s\.\-\']{3,40}$', '', line_stripped)
-            if clean_line != line_stripped:
-                print(f"  ✂️  Trimmed photo credit from line: '{line_stripped}' -> '{clean_line}'")
-                removed_count += 1
-                line_stripped = clean_line
-        
-        if re.match(r'^[Pp]hoto(?:s)?\s+by\s+[A-Za-z\s\.\-\']{3,40},?\s*', line_stripped):
-            clean_line = re.sub(r'^[Pp]hoto(?:s)?\s+by\s+[A-Za-z\s\.\-\']{3,40},?\s*', '', line_stripped)
-            if clean_line != line_stripped:
-                print(f"  ✂️  Trimmed photo credit from start: '{line_stripped}' -> '{clean_line}'")
-                removed_count += 1
-                line_stripped = clean_line
-        
-        if line_stripped in KNOWN_SUBTITLES:
-            if not line_stripped.startswith('**'):
-                line_stripped = f"\n**{line_stripped}**\n"
-                print(f"  📝 Formatted subtitle: {line_stripped.strip()}")
-        
-        if line_stripped:
-            cleaned_lines.append(line_stripped)
+                continue
+            
+            if 'photo' in line_lower:
+                clean_line, trimmed = PHOTO_BY_SUFFIX_RE.subn('', line_stripped)
+                if trimmed:
+                    print(f"  ✂️  Trimmed photo credit from line: '{line_stripped}' -> '{clean_line}'")
+                    removed_count += 1
+                    line_stripped = clean_line
+                
+                clean_line, trimmed = PHOTO_BY_PREFIX_RE.subn('', line_stripped)
+                if trimmed:
+                    print(f"  ✂️  Trimmed photo credit from start: '{line_stripped}' -> '{clean_line}'")
+                    removed_count += 1
+                    line_stripped = clean_line
+            
+            if line_stripped in KNOWN_SUBTITLES:
+                if not line_stripped.startswith('**'):
+                    line_stripped = f"\n**{line_stripped}**\n"
+                    print(f"  📝 Formatted subtitle: {line_stripped.strip()}")
+            
+            if line_stripped:
+                yield line_stripped
     
-    result = '\n'.join(cleaned_lines)
-    result = re.sub(r'\n{4,}', '\n\n\n', result)
+    result = '\n'.join(_cleaned_lines())
+    result = EXCESS_NEWLINES_RE.sub('\n\n\n', result)
     
     print(f"  📊 Removed {removed_count} photo credit references")
     return result.strip()
 
 
-def fix_article(db, article_id: int) -> bool:
-    """Fix a specific article by ID"""
-    article = db.query(ContentQueue).filter(ContentQueue.id == article_id).first()
-    
-    if not article:
-        print(f"❌ Article {article_id} not found")
-        return False
-    
-    print(f"\n📰 Processing article {article_id}: {article.translated_title[:60] if article.translated_title else 'No title'}...")
+def clean_article(article) -> Optional[str]:
+    """Return the cleaned text of a loaded article, or None if nothing changed"""
+    print(f"\n📰 Processing article {article.id}: {article.translated_title[:60] if article.translated_title else 'No title'}...")
     print(f"   Source: {article.source}")
     print(f"   Status: {article.status}")
     
@@ -120,29 +129,60 @@ def fix_article(db, article_id: int) -> bool:
     new_length = len(cleaned_content) if cleaned_content else 0
     
     if cleaned_content != article.translated_text:
-        article.translated_text = cleaned_content
-        db.commit()
-        print(f"✅ Article {article_id} updated successfully!")
         print(f"   Content length: {original_length} -> {new_length} chars")
-        return True
-    else:
-        print(f"ℹ️  Article {article_id} - no changes needed")
+        return cleaned_content
+    
+    print(f"ℹ️  Article {article.id} - no changes needed")
+    return None
+
+
+def fix_article(db, article_id: int) -> bool:
+    """Fix a specific article by ID"""
+    article = db.query(ContentQueue).filter(ContentQueue.id == article_id).first()
+    
+    if not article:
+        print(f"❌ Article {article_id} not found")
         return False
+    
+    cleaned_content = clean_article(article)
+    if cleaned_content is None:
+        return False
+    
+    article.translated_text = cleaned_content
+    db.commit()
+    print(f"✅ Article {article_id} updated successfully!")
+    return True
 
 
-def fix_all_mrm_articles(db) -> int:
-    """Fix all Modern Restaurant Management articles"""
-    articles = db.query(ContentQueue).filter(
+def fix_all_mrm_articles(db, batch_size: int = 50) -> int:
+    """Fix all Modern Restaurant Management articles, streaming rows in batches"""
+    query = db.query(ContentQueue).filter(
         ContentQueue.source == 'Modern Restaurant Management',
         ContentQueue.status.in_(['posted', 'approved', 'pending_approval'])
-    ).all()
+    )
     
-    print(f"\n🔍 Found {len(articles)} Modern Restaurant Management articles")
+    print(f"\n🔍 Found {query.count()} Modern Restaurant Management articles")
     
     fixed_count = 0
-    for article in articles:
-        if fix_article(db, article.id):
-            fixed_count += 1
+    updates = []
+    for article in query.yield_per(batch_size):
+        cleaned_content = clean_article(article)
+        if cleaned_content is None:
+            continue
+        
+        updates.append({"id": article.id, "translated_text": cleaned_content})
+        if len(updates) >= batch_size:
+            db.execute(update(ContentQueue), updates)
+            fixed_count += len(updates)
+            updates = []
+    
+    if updates:
+        db.execute(update(ContentQueue), updates)
+        fixed_count += len(updates)
+    
+    # A single commit at the end: committing mid-iteration would close the
+    # server-side cursor that yield_per streams from.
+    db.commit()
     
     return fixed_count
 
@@ -16,22 +16,18 @@ engine = create_engine(DATABASE_URL)
 def fix_constraint():
     print("🔧 Fixing status constraint...")
     
-    with engine.connect() as conn:
+    # Drop and re-add in one transaction so the table is never left without
+    # a status constraint.
+    with engine.begin() as conn:
         conn.execute(text("""
             ALTER TABLE content_queue DROP CONSTRAINT IF EXISTS valid_status;
-        """))
-        conn.commit()
-        
-        print("✓ Old constraint dropped")
-        
-        conn.execute(text("""
             ALTER TABLE content_queue ADD CONSTRAINT valid_status 
             CHECK (status IN ('draft', 'pending_approval', 'approved', 'rejected', 'posted', 'posting_facebook', 'posting_linkedin'));
         """))
-        conn.commit()
-        
-        print("✓ New constraint added")
-        
+    
+    print("✓ Constraint replaced")
+    
+    with engine.connect() as conn:
         result = conn.execute(text("""
             SELECT constraint_name, check_clause 
             FROM information_schema.check_constraints 
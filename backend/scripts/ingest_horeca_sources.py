@@ -6,6 +6,7 @@ Ingest articles from leading HoReCa industry sources into Pinecone for Maya's RA
 import sys
 import os
 import asyncio
+import hashlib
 import time
 import re
 from datetime import datetime
@@ -14,10 +15,10 @@ from typing import List, Dict, Optional
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from pinecone import Pinecone
 
-from services.rag_utils import get_embedding
+from services.rag_utils import get_embeddings_batch
 
 HORECA_SOURCES = [
     {
@@ -73,13 +74,69 @@ HEADERS = {
     "Accept-Language": "en-US,en;q=0.5"
 }
 
+# Sized for every source scraping at full concurrency, so connections to each
+# host stay pooled between articles instead of being re-established.
+HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+
+# Tried in order; each tier is one combined selector so the tree is walked
+# once per tier rather than once per selector.
+CONTENT_SELECTORS = [
+    'article',
+    '.article-content, .article-body, .post-content, .entry-content, .content-body, '
+    '[itemprop="articleBody"], .story-body',
+    'main'
+]
+
+CONTENT_CLASSES = {'article-content', 'article-body', 'post-content', 'entry-content', 'content-body', 'story-body'}
+
+# Strips every line and drops blank ones in a single pass.
+LINE_BREAK_RE = re.compile(r'\s*\n\s*')
+
+NOISE_TAGS = ['script', 'style', 'nav', 'header', 'footer', 'aside', 'iframe', 'noscript']
+
+
+class ArticleContentStrainer(SoupStrainer):
+    """Only build the subtrees that CONTENT_SELECTORS can match; everything else is skipped at parse time.
+    
+    NOISE_TAGS containers are kept too, so that _select_content can still decompose an <article>
+    teaser nested in a header, nav or sidebar instead of it surfacing as a top-level match.
+    """
+    
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        if name in ('article', 'main') or name in NOISE_TAGS:
+            return True
+        if attrs.get('itemprop') == 'articleBody':
+            return True
+        classes = attrs.get('class') or ''
+        if isinstance(classes, str):
+            classes = classes.split()
+        return not CONTENT_CLASSES.isdisjoint(classes)
+    
+    def allow_string_creation(self, string) -> bool:
+        return False
+
+
+ARTICLE_STRAINER = ArticleContentStrainer()
+
+
+def _select_content(soup: BeautifulSoup) -> Optional[str]:
+    for tag in soup.find_all(NOISE_TAGS):
+        tag.decompose()
+    
+    for selector in CONTENT_SELECTORS:
+        elem = soup.select_one(selector)
+        if elem:
+            return elem.get_text(separator='\n', strip=True)
+    
+    return None
+
 
 async def fetch_rss_articles(source: Dict, client: httpx.AsyncClient, limit: int = 15) -> List[Dict]:
     """Fetch article URLs from RSS feed"""
     articles = []
     
     try:
-        response = await client.get(source["rss_url"], headers=HEADERS, timeout=30.0)
+        response = await client.get(source["rss_url"])
         
         if response.status_code != 200:
             print(f"  ⚠️ RSS returned {response.status_code}")
@@ -111,119 +168,116 @@ async def fetch_rss_articles(source: Dict, client: httpx.AsyncClient, limit: int
     return articles
 
 
-async def scrape_article_content(url: str, client: httpx.AsyncClient) -> Optional[str]:
-    """Scrape article content from URL"""
+def _extract_content(html: str) -> Optional[str]:
+    """Parse an article page and return its cleaned text (CPU-bound, run off the event loop)"""
     try:
-        response = await client.get(url, headers=HEADERS, timeout=30.0, follow_redirects=True)
-        
-        if response.status_code != 200:
-            return None
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        for tag in soup.find_all(['script', 'style', 'nav', 'header', 'footer', 'aside', 'iframe', 'noscript']):
-            tag.decompose()
-        
-        content_selectors = [
-            'article',
-            '.article-content',
-            '.article-body',
-            '.post-content',
-            '.entry-content',
-            '.content-body',
-            '[itemprop="articleBody"]',
-            '.story-body',
-            'main'
-        ]
-        
+        content = _select_content(BeautifulSoup(html, 'lxml', parse_only=ARTICLE_STRAINER))
+    except Exception:
         content = None
-        for selector in content_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                content = elem.get_text(separator='\n', strip=True)
-                break
-        
+    
+    if not content:
+        soup = BeautifulSoup(html, 'html.parser')
+        content = _select_content(soup)
         if not content:
             body = soup.find('body')
             if body:
                 content = body.get_text(separator='\n', strip=True)
+    
+    if content:
+        content = LINE_BREAK_RE.sub('\n', content).strip()
         
-        if content:
-            lines = [line.strip() for line in content.split('\n') if line.strip()]
-            content = '\n'.join(lines)
-            
-            content = re.sub(r'\n{3,}', '\n\n', content)
-            
-            if len(content) > 100:
-                return content[:8000]
+        if len(content) > 100:
+            return content[:8000]
+    
+    return None
+
+
+async def scrape_article_content(url: str, client: httpx.AsyncClient) -> Optional[str]:
+    """Scrape article content from URL"""
+    try:
+        response = await client.get(url)
         
-        return None
+        if response.status_code != 200:
+            return None
+        
+        return await asyncio.to_thread(_extract_content, response.text)
         
     except Exception as e:
         print(f"    ⚠️ Scrape error: {e}")
         return None
 
 
-async def ingest_horeca_article(article: Dict, source: Dict, index) -> bool:
-    """Ingest a single HoReCa article into Pinecone"""
-    try:
-        title = article.get('title', 'Untitled')
-        content = article.get('content', '')
-        url = article.get('url', '')
-        
-        if not content or len(content) < 100:
-            return False
-        
-        article_text = f"""SOURCE: {source['name']}
+def build_article_text(article: Dict, source: Dict) -> Optional[str]:
+    """Build the text that gets embedded for a single HoReCa article"""
+    content = article.get('content', '')
+    
+    if not content or len(content) < 100:
+        return None
+    
+    return f"""SOURCE: {source['name']}
 CATEGORY: {source['category'].replace('_', ' ').title()}
 REGION: {source['region'].title()} (applicable to Ukraine)
 SECTOR: {source['sector'].title()}
 
-TITLE: {title}
+TITLE: {article.get('title', 'Untitled')}
 
 CONTENT:
 {content}
 
 This is industry knowledge from {source['name']}, a leading HoReCa publication,
 providing insights for restaurant, hotel, and cafe operators in Ukraine."""
-        
-        embedding = get_embedding(article_text)
-        
-        vector_id = f"horeca_{source['sector']}_{hash(url) % 10000000}_{int(datetime.now().timestamp())}"
-        
-        vector = {
-            "id": vector_id,
-            "values": embedding,
-            "metadata": {
-                "text": article_text[:1500],
-                "title": title[:200],
-                "source": source['name'],
-                "source_url": url[:300],
-                "category": source['category'],
-                "region": source['region'],
-                "content_type": "industry_article",
-                "is_gradus_content": False,
-                "industry_sector": source['sector'],
-                "published_date": article.get('published', '')[:50] if article.get('published') else '',
-                "relevance": "high",
-                "created_at": datetime.now().isoformat()
-            }
+
+
+def horeca_vector_id(source: Dict, url: str) -> str:
+    """Deterministic vector ID, so re-ingesting a URL overwrites its previous vector"""
+    url_hash = hashlib.blake2b(url.encode('utf-8'), digest_size=8).hexdigest()
+    return f"horeca_{source['sector']}_{url_hash}"
+
+
+def build_horeca_vector(article: Dict, source: Dict, article_text: str, embedding: List[float]) -> Dict:
+    """Build the Pinecone vector for a single embedded HoReCa article"""
+    title = article.get('title', 'Untitled')
+    url = article.get('url', '')
+    
+    return {
+        "id": horeca_vector_id(source, url),
+        "values": embedding,
+        "metadata": {
+            "text": article_text[:1500],
+            "title": title[:200],
+            "source": source['name'],
+            "source_url": url[:300],
+            "category": source['category'],
+            "region": source['region'],
+            "content_type": "industry_article",
+            "is_gradus_content": False,
+            "industry_sector": source['sector'],
+            "published_date": article.get('published', '')[:50] if article.get('published') else '',
+            "relevance": "high",
+            "created_at": datetime.now().isoformat()
         }
-        
-        index.upsert(vectors=[vector], namespace="company_knowledge")
-        return True
-        
+    }
+
+
+def filter_new_articles(articles: List[Dict], source: Dict, index) -> List[Dict]:
+    """Drop articles whose vector is already in the index, so they are not re-scraped or re-embedded"""
+    ids = [horeca_vector_id(source, article['url']) for article in articles]
+    
+    try:
+        existing = set(index.fetch(ids=ids, namespace="company_knowledge").vectors.keys())
     except Exception as e:
-        print(f"    ❌ Ingest error: {e}")
-        return False
+        print(f"  ⚠️ Could not check existing vectors, ingesting all: {e}")
+        return articles
+    
+    return [article for article, vector_id in zip(articles, ids) if vector_id not in existing]
 
 
-async def process_source(source: Dict, index, client: httpx.AsyncClient, articles_per_source: int = 12) -> Dict:
-    """Process a single HoReCa source"""
+async def process_source(source: Dict, index, client: httpx.AsyncClient, articles_per_source: int = 12, concurrency: int = 5) -> Dict:
+    """Process a single HoReCa source, scraping up to `concurrency` articles at once"""
     print(f"\n📰 {source['name']}")
     print(f"   {source['description']}")
     
-    results = {"total": 0, "success": 0, "failed": 0}
+    results = {"total": 0, "success": 0, "failed": 0, "skipped": 0}
     
     articles = await fetch_rss_articles(source, client, limit=articles_per_source)
     
@@ -231,30 +285,57 @@ async def process_source(source: Dict, index, client: httpx.AsyncClient, article
         print("  ⚠️ No articles found, trying sitemap...")
         return results
     
-    for article in articles:
-        results["total"] += 1
-        
-        print(f"  📄 {article['title'][:60]}...")
-        
-        await asyncio.sleep(1.5)
-        
-        content = await scrape_article_content(article['url'], client)
+    new_articles = filter_new_articles(articles, source, index)
+    results["skipped"] = len(articles) - len(new_articles)
+    if results["skipped"]:
+        print(f"  ⏭️ Skipping {results['skipped']} already ingested articles")
+    articles = new_articles
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def _scrape_article(article: Dict) -> Optional[str]:
+        async with semaphore:
+            print(f"  📄 {article['title'][:60]}...")
+            await asyncio.sleep(1.5)
+            content = await scrape_article_content(article['url'], client)
         
         if not content:
-            print(f"    ⚠️ Could not extract content")
-            results["failed"] += 1
-            continue
+            print(f"    ⚠️ Could not extract content: {article['title'][:60]}")
+            return None
         
         article['content'] = content
         
-        success = await ingest_horeca_article(article, source, index)
-        
-        if success:
-            print(f"    ✅ Ingested")
-            results["success"] += 1
+        return build_article_text(article, source)
+    
+    outcomes = await asyncio.gather(*(_scrape_article(a) for a in articles), return_exceptions=True)
+    
+    scraped = []
+    for article, outcome in zip(articles, outcomes):
+        results["total"] += 1
+        if isinstance(outcome, str):
+            scraped.append((article, outcome))
         else:
+            if isinstance(outcome, Exception):
+                print(f"    ❌ Article error: {outcome}")
             results["failed"] += 1
     
+    batch_size = 100
+    for i in range(0, len(scraped), batch_size):
+        batch = scraped[i:i+batch_size]
+        try:
+            embeddings = get_embeddings_batch([article_text for _, article_text in batch])
+            vectors = [
+                build_horeca_vector(article, source, article_text, embedding)
+                for (article, article_text), embedding in zip(batch, embeddings)
+            ]
+            index.upsert(vectors=vectors, namespace="company_knowledge")
+            results["success"] += len(batch)
+        except Exception as e:
+            print(f"    ❌ Ingest error: {e}")
+            results["failed"] += len(batch)
+    
+    print(f"  📤 Uploaded {results['success']} vectors from {source['name']}")
+    
     return results
 
 
@@ -281,20 +362,22 @@ async def main():
     print(f"✅ Connected to Pinecone index: {index_name}")
     print(f"📚 Processing {len(HORECA_SOURCES)} HoReCa sources...")
     
-    total_stats = {"total": 0, "success": 0, "failed": 0}
-    
-    async with httpx.AsyncClient() as client:
-        for source in HORECA_SOURCES:
-            try:
-                results = await process_source(source, index, client)
-                total_stats["total"] += results["total"]
-                total_stats["success"] += results["success"]
-                total_stats["failed"] += results["failed"]
-                
-                await asyncio.sleep(3)
-                
-            except Exception as e:
-                print(f"  ❌ Source error: {e}")
+    total_stats = {"total": 0, "success": 0, "failed": 0, "skipped": 0}
+    
+    async with httpx.AsyncClient(headers=HEADERS, timeout=30.0, follow_redirects=True, limits=HTTP_LIMITS) as client:
+        source_results = await asyncio.gather(
+            *(process_source(source, index, client) for source in HORECA_SOURCES),
+            return_exceptions=True
+        )
+    
+    for results in source_results:
+        if isinstance(results, Exception):
+            print(f"  ❌ Source error: {results}")
+            continue
+        total_stats["total"] += results["total"]
+        total_stats["success"] += results["success"]
+        total_stats["failed"] += results["failed"]
+        total_stats["skipped"] += results["skipped"]
     
     print("\n" + "=" * 60)
     print("📊 INGESTION SUMMARY:")
@@ -302,6 +385,7 @@ async def main():
     print(f"   Total articles: {total_stats['total']}")
     print(f"   Successfully ingested: {total_stats['success']}")
     print(f"   Failed: {total_stats['failed']}")
+    print(f"   Already ingested: {total_stats['skipped']}")
     
     if total_stats['success'] > 0:
         print("\n✅ Maya now has HoReCa industry knowledge!")
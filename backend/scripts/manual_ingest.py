@@ -0,0 +1,184 @@
+"""
+Manual product ingestion - COMPLETE PRODUCT LINE for one brand
+Shared by manual_adjari_ingest.py and manual_product_ingest.py, which
+supply each brand's metadata; product text lives in data/products/<brand>.txt.
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+from services.rag_utils import chunk_text
+from services.embedding_cache import get_or_embed_batch
+from pinecone import Pinecone
+
+
+PRODUCTS_DIR = Path(__file__).resolve().parent.parent / "data" / "products"
+
+# Backoff schedule (seconds) for re-sending an upsert batch that failed
+UPSERT_RETRY_DELAYS = [1, 2, 4, 8, 16]
+
+
+def manual_vector_id_prefix(brand: str) -> str:
+    """Prefix of every vector ID manual_ingest writes for brand (also used to find them again)"""
+    return f"{brand}_PRODUCT_MANUAL_"
+
+
+def _wait_for_upsert(index, batch: List[dict], result) -> None:
+    """Wait for an async upsert, re-sending the batch with backoff if it failed"""
+    try:
+        result.get()
+        return
+    except Exception as e:
+        error = e
+    
+    for delay in UPSERT_RETRY_DELAYS:
+        print(f"   ⚠️ Upsert of {len(batch)} vectors failed ({error}), retrying in {delay}s...")
+        time.sleep(delay)
+        try:
+            index.upsert(vectors=batch, namespace="company_knowledge")
+            return
+        except Exception as e:
+            error = e
+    
+    raise error
+
+
+def manual_ingest(brand: str, source_url: str, category: str,
+                  coverage: str, highlights: List[str], summary: str) -> int:
+    """Manually ingest one brand's complete product line; returns the number of vectors uploaded"""
+    
+    content = (PRODUCTS_DIR / f"{brand.lower()}.txt").read_text(encoding="utf-8")
+    
+    PINECONE_API_KEY = os.environ.get("PINECONE_API_KEY")
+    PINECONE_INDEX_NAME = os.environ.get("PINECONE_INDEX_NAME")
+    
+    if not PINECONE_API_KEY or not PINECONE_INDEX_NAME:
+        print("❌ Environment variables not set!")
+        return 0
+    
+    pc = Pinecone(api_key=PINECONE_API_KEY)
+    index = pc.Index(PINECONE_INDEX_NAME, pool_threads=30)
+    
+    print(f"\n{'='*60}")
+    print(f"🔄 Processing {brand} - COMPLETE PRODUCT LINE")
+    print(f"{'='*60}")
+    
+    enriched = f"""{content}
+
+[COMPANY CONTEXT: {brand} is distributed by Best Brands, Ukraine's largest alcohol distributor with 40,000+ retail points. Best Brands (formerly AVTD) represents premium brands across vodka, cognac, and wine categories.]
+"""
+    
+    chunks = chunk_text(enriched, chunk_size=500, overlap=50)
+    print(f"   📦 Created {len(chunks)} chunks")
+    print(f"   🎯 Covering {coverage}")
+    
+    ingested_at = datetime.now()
+    timestamp = int(ingested_at.timestamp())
+    scraped_at = ingested_at.isoformat()
+    id_prefix = manual_vector_id_prefix(brand)
+    
+    # Duplicate chunks share one embedding but keep their own vector id
+    indices_by_chunk = {}
+    for i, chunk in enumerate(chunks):
+        indices_by_chunk.setdefault(chunk, []).append(i)
+    
+    unique_chunks = list(indices_by_chunk)
+    if len(unique_chunks) < len(chunks):
+        print(f"   ♻️ {len(chunks) - len(unique_chunks)} duplicate chunks share an embedding")
+    
+    # Embed on a producer thread while this thread upserts finished batches,
+    # so OpenAI and Pinecone round trips overlap.
+    embedded = queue.Queue(maxsize=4)
+    embed_errors = []
+    
+    def _embed_chunks():
+        embed_batch_size = 96
+        try:
+            for start in range(0, len(unique_chunks), embed_batch_size):
+                chunk_batch = unique_chunks[start:start+embed_batch_size]
+                embedded.put((chunk_batch, get_or_embed_batch(chunk_batch)))
+        except Exception as e:
+            print(f"   ❌ Embedding failed, stopping ingest: {e}")
+            embed_errors.append(e)
+        finally:
+            embedded.put(None)
+    
+    producer = threading.Thread(target=_embed_chunks, daemon=True)
+    producer.start()
+    
+    batch_size = 100
+    pending = []
+    async_results = []
+    uploaded = 0
+    
+    while True:
+        item = embedded.get()
+        if item is None:
+            break
+        
+        for chunk, embedding in zip(*item):
+            for i in indices_by_chunk[chunk]:
+                vector_id = f"{id_prefix}{i}_{timestamp}"
+                
+                vector = {
+                    "id": vector_id,
+                    "values": embedding,
+                    "metadata": {
+                        "text": chunk,
+                        "brand": brand,
+                        "source": source_url,
+                        "source_type": "company_website",
+                        "category": category,
+                        "company": "Best Brands",
+                        "content_type": "PRODUCT",
+                        "is_product_info": True,
+                        "section_name": "Complete Product Line",
+                        "enriched": True,
+                        "chunk_index": i,
+                        "scraped_at": scraped_at
+                    }
+                }
+                pending.append(vector)
+        
+        while len(pending) >= batch_size:
+            batch = pending[:batch_size]
+            async_results.append((batch, index.upsert(vectors=batch, namespace="company_knowledge", async_req=True)))
+            uploaded += batch_size
+            pending = pending[batch_size:]
+    
+    producer.join()
+    
+    if pending:
+        async_results.append((pending, index.upsert(vectors=pending, namespace="company_knowledge", async_req=True)))
+        uploaded += len(pending)
+    
+    for batch, result in async_results:
+        _wait_for_upsert(index, batch, result)
+    
+    if embed_errors:
+        raise embed_errors[0]
+    
+    if uploaded:
+        print(f"   📤 Uploaded {uploaded} vectors")
+        print(f"   🎯 All tagged with content_type='PRODUCT'")
+        for line in highlights:
+            print(f"   {line}")
+    
+    print(f"✅ Ingested {brand}")
+    
+    print(f"\n{'='*60}")
+    print(f"✅ MANUAL INGESTION COMPLETE!")
+    print(f"📊 Total vectors uploaded: {uploaded}")
+    print(f"🎯 All tagged as PRODUCT for priority retrieval!")
+    print(summary)
+    print(f"{'='*60}")
+    
+    return uploaded
@@ -7,7 +7,7 @@ import time
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from services.unsplash_service import UnsplashService
 
 DATABASE_URL = os.getenv('NEON_DATABASE_URL') or os.getenv('DATABASE_URL')
@@ -28,15 +28,20 @@ def refetch_article_images():
     cur = conn.cursor()
     
     try:
+        cur.execute(
+            "SELECT id, translated_title, translated_text, image_photographer FROM content_queue WHERE id = ANY(%s)",
+            (ARTICLE_IDS_TO_REFETCH,)
+        )
+        rows_by_id = {row['id']: row for row in cur.fetchall()}
+        
+        updates = []
+        downloads = []
+        
         for article_id in ARTICLE_IDS_TO_REFETCH:
             print(f"\n{'='*60}")
             print(f"Processing Article ID: {article_id}")
             
-            cur.execute(
-                "SELECT id, translated_title, translated_text, image_photographer FROM content_queue WHERE id = %s",
-                (article_id,)
-            )
-            row = cur.fetchone()
+            row = rows_by_id.get(article_id)
             
             if not row:
                 print(f"Article {article_id} not found!")
@@ -49,17 +54,22 @@ def refetch_article_images():
             print(f"Title: {title[:60]}...")
             print(f"Current photographer: {current_photographer or 'None'}")
             
-            queries = unsplash.generate_ai_queries(title, content)
-            if not queries:
-                queries = unsplash.extract_smart_keywords(title, content)
-            
-            print(f"Generated queries: {queries[:3]}...")
-            
-            images = unsplash.fetch_unsplash_images(queries, limit=3)
+            # One failed lookup skips this article only; images already picked
+            # for earlier articles are still written below
+            try:
+                queries = unsplash.generate_ai_queries(title, content)
+                if not queries:
+                    queries = unsplash.extract_smart_keywords(title, content)
+                
+                print(f"Generated queries: {queries[:3]}...")
+                
+                images = unsplash.fetch_unsplash_images(queries, limit=3)
+            except Exception as e:
+                print(f"❌ Image lookup failed, skipping article: {e}")
+                continue
             
             if images:
-                images.sort(key=lambda x: x.get('aesthetic_score', 0), reverse=True)
-                best_image = images[0]
+                best_image = max(images, key=lambda x: x.get('aesthetic_score', 0))
                 
                 print(f"\nNew Image Selected:")
                 print(f"  Photographer: {best_image['photographer_name']}")
@@ -67,36 +77,43 @@ def refetch_article_images():
                 print(f"  Query Used: {best_image.get('query_used', 'N/A')}")
                 print(f"  Likes: {best_image.get('likes', 0)}")
                 
-                cur.execute(
-                    """
-                        UPDATE content_queue SET 
-                            image_url = %s,
-                            image_photographer = %s,
-                            image_credit = %s,
-                            image_credit_url = %s,
-                            unsplash_image_id = %s
-                        WHERE id = %s
-                    """,
-                    (
-                        best_image['url'],
-                        best_image['photographer_name'],
-                        f"Photo by {best_image['photographer_name']} on Unsplash",
-                        best_image['photographer_url'],
-                        best_image['id'],
-                        article_id
-                    )
-                )
-                conn.commit()
-                
-                unsplash.trigger_download(best_image['download_url'])
-                
-                print(f"Updated successfully!")
+                updates.append((
+                    article_id,
+                    best_image['url'],
+                    best_image['photographer_name'],
+                    f"Photo by {best_image['photographer_name']} on Unsplash",
+                    best_image['photographer_url'],
+                    best_image['id']
+                ))
+                downloads.append(best_image['download_url'])
                 
             else:
                 print(f"No suitable images found")
             
             time.sleep(2)
         
+        if updates:
+            execute_values(
+                cur,
+                """
+                    UPDATE content_queue SET 
+                        image_url = v.url,
+                        image_photographer = v.photographer,
+                        image_credit = v.credit,
+                        image_credit_url = v.credit_url,
+                        unsplash_image_id = v.unsplash_id
+                    FROM (VALUES %s) AS v(id, url, photographer, credit, credit_url, unsplash_id)
+                    WHERE content_queue.id = v.id
+                """,
+                updates,
+                page_size=len(updates)
+            )
+            conn.commit()
+            print(f"\nUpdated {len(updates)} articles")
+            
+            for download_url in downloads:
+                unsplash.trigger_download(download_url)
+        
         print(f"\n{'='*60}")
         print(f"Refetch complete!")
         
@@ -8,21 +8,21 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from pinecone import Pinecone
-from openai import OpenAI
+
+from manual_ingest import manual_vector_id_prefix
+from services.rag_utils import get_embedding
 
 pc = Pinecone(api_key=os.getenv('PINECONE_API_KEY'))
 index = pc.Index(os.getenv('PINECONE_INDEX_NAME', 'gradus-media'))
-openai_client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
 
 NAMESPACE = "company_knowledge"
 
-def get_embedding(text):
-    response = openai_client.embeddings.create(
-        model="text-embedding-3-small",
-        input=text
-    )
-    return response.data[0].embedding
+# Brand metadata values as manual_ingest writes them (manual_adjari_ingest
+# passes brand="ADJARI"); vector IDs start with manual_vector_id_prefix(brand)
+discontinued_brands = ['MARLIN', 'ADJARI', 'KRISTI VALLEY']
 
+# Fallback for records written before the brand/ID conventions, or under
+# Cyrillic and misspelled names: similarity search + keyword match
 search_terms = [
     'marlin vodka', 'марлін горілка', 'marlin водка',
     'adjari cognac', 'аджарі коньяк', 'adjari коньяк',
@@ -37,42 +37,50 @@ keywords_to_match = [
     'kristi', 'kristal', 'крісті', 'крістал'
 ]
 
-print("🔍 Searching for discontinued products in vector DB...")
+print("🔍 Deleting discontinued products from vector DB...")
+print(f"  📍 Brands: {', '.join(discontinued_brands)}")
+
+assert NAMESPACE == "company_knowledge"
+index.delete(
+    filter={"brand": {"$in": discontinued_brands}},
+    namespace=NAMESPACE
+)
 
-total_deleted = 0
-all_ids_to_delete = set()
+ids_to_delete = []
+for brand in discontinued_brands:
+    for id_page in index.list(prefix=manual_vector_id_prefix(brand), namespace=NAMESPACE):
+        ids_to_delete.extend(id_page)
 
+print(f"  📍 Found {len(ids_to_delete)} entries by ID prefix")
+
+seen_ids = set(ids_to_delete)
 for term in search_terms:
-    print(f"\n📍 Searching: {term}")
-    query_embedding = get_embedding(term)
-    
     results = index.query(
-        vector=query_embedding,
+        vector=get_embedding(term),
         top_k=50,
         include_metadata=True,
         namespace=NAMESPACE
     )
-    
+
     for match in results.matches:
+        if match.id in seen_ids:
+            continue
         metadata_text = str(match.metadata).lower()
         if any(word in metadata_text for word in keywords_to_match):
-            all_ids_to_delete.add(match.id)
+            seen_ids.add(match.id)
+            ids_to_delete.append(match.id)
             source = match.metadata.get('source', 'unknown')[:50]
             print(f"  📌 Found: {match.id[:30]}... | score: {match.score:.3f} | source: {source}")
 
-if all_ids_to_delete:
-    ids_list = list(all_ids_to_delete)
-    print(f"\n🗑️ Deleting {len(ids_list)} entries...")
-    
-    batch_size = 100
-    for i in range(0, len(ids_list), batch_size):
-        batch = ids_list[i:i+batch_size]
-        assert NAMESPACE == "company_knowledge"
+if ids_to_delete:
+    print(f"\n🗑️ Deleting {len(ids_to_delete)} entries...")
+
+    batch_size = 1000
+    for i in range(0, len(ids_to_delete), batch_size):
+        batch = ids_to_delete[i:i+batch_size]
         index.delete(ids=batch, namespace=NAMESPACE)
         print(f"  ✅ Deleted batch {i//batch_size + 1}: {len(batch)} entries")
-    
-    total_deleted = len(ids_list)
 else:
-    print("\n✅ No discontinued products found in vector DB")
+    print("\n✅ No further discontinued product entries found")
 
-print(f"\n🎉 Cleanup complete! Total deleted: {total_deleted}")
+print(f"\n🎉 Cleanup complete! Deleted by ID: {len(ids_to_delete)}")
@@ -5,6 +5,8 @@ Usage: python scripts/test_bestbrands_video.py
 """
 
 import os
+import re
+import stat
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -89,11 +91,16 @@ def test_video_file():
     passed = 0
     failed = 0
     
-    if os.path.exists(BEST_BRANDS_VIDEO_PATH):
+    try:
+        st = os.stat(BEST_BRANDS_VIDEO_PATH)
+    except OSError:
+        st = None
+    
+    if st is not None and stat.S_ISREG(st.st_mode):
         print(f"  ✅ PASS: Video file exists at {BEST_BRANDS_VIDEO_PATH}")
         passed += 1
         
-        size_mb = os.path.getsize(BEST_BRANDS_VIDEO_PATH) / (1024 * 1024)
+        size_mb = st.st_size / (1024 * 1024)
         print(f"  📦 File size: {size_mb:.2f} MB")
         
         if size_mb < 50:
@@ -133,8 +140,12 @@ def test_text_fallback():
         "avtd.com",
     ]
     
+    # One scan of the fallback text for all required strings
+    required_re = re.compile('|'.join(map(re.escape, required_content)))
+    found = set(required_re.findall(BESTBRANDS_TEXT_FALLBACK))
+    
     for content in required_content:
-        if content in BESTBRANDS_TEXT_FALLBACK:
+        if content in found:
             print(f"  ✅ PASS: Contains '{content}'")
             passed += 1
         else:
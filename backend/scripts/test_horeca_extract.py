@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script for HoReCa article content extraction
+Usage: python scripts/test_horeca_extract.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.ingest_horeca_sources import _extract_content
+
+
+BODY = "Real article body sentence about restaurant operations. " * 5
+
+
+def test_nested_teasers():
+    """Article teasers inside header/nav/aside must not win over the real body"""
+    print("=" * 60)
+    print("NESTED TEASER TESTS")
+    print("=" * 60)
+
+    cases = [
+        (
+            f"<html><body><header><nav><article>short teaser</article></nav></header>"
+            f"<main><article>{BODY}</article></main></body></html>",
+            "article inside header > nav"
+        ),
+        (
+            f"<html><body><aside><article>sidebar teaser</article></aside>"
+            f"<div class=\"entry-content\">{BODY}</div></body></html>",
+            "article inside aside before .entry-content"
+        ),
+        (
+            f"<html><body><article>{BODY}</article></body></html>",
+            "plain article"
+        ),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for html, description in cases:
+        content = _extract_content(html)
+        if content and content.startswith("Real article body") and "teaser" not in content:
+            print(f"  ✅ PASS: {description}")
+            passed += 1
+        else:
+            print(f"  ❌ FAIL: {description} - got {content!r}")
+            failed += 1
+
+    print(f"\n📊 Nested Teaser Tests: {passed} passed, {failed} failed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = test_nested_teasers()
+    sys.exit(0 if success else 1)
@@ -14,6 +14,7 @@ import sys
 import os
 import argparse
 import logging
+from itertools import islice
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -24,6 +25,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+EMBED_BATCH_SIZE = 64
+EMBED_CONCURRENCY = 10
+
+
+def _batched(iterable, size):
+    """Yield lists of up to size items (itertools.batched needs Python 3.12)"""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _collect(iterable, sink: list):
+    """Pass items through unchanged while keeping a copy in sink"""
+    for item in iterable:
+        sink.append(item)
+        yield item
+
 
 async def main(input_file: str):
     """Upload HR knowledge base"""
@@ -69,38 +87,51 @@ async def main(input_file: str):
     processor = HRContentProcessor()
     
     logger.info(f"Reading content from: {input_file}")
+    logger.info(f"Document size: {os.path.getsize(input_file)} bytes")
+    
+    # Parse, chunk, embed and upload as one streaming pipeline; up to
+    # EMBED_CONCURRENCY batches are on the network at a time.
+    logger.info("\n1-4. Parsing, chunking, embedding and uploading to Pinecone (namespace: hr_docs)...")
+    items = []
+    embedded_chunks = []
+    pinecone_ids = []
+    
+    in_flight = asyncio.Semaphore(EMBED_CONCURRENCY)
+    
+    async def _embed_and_upload(batch):
+        try:
+            chunks_with_embeddings = await asyncio.to_thread(processor.embed_batch, batch)
+            batch_ids = await processor.upload_to_pinecone(
+                chunks_with_embeddings,
+                pinecone_index,
+                namespace="hr_docs"
+            )
+            return chunks_with_embeddings, batch_ids
+        finally:
+            in_flight.release()
+    
+    tasks = []
     with open(input_file, 'r', encoding='utf-8') as f:
-        doc_text = f.read()
+        items_iter = _collect(processor.iter_parse(f), items)
+        for batch in _batched(processor.iter_chunks(items_iter), EMBED_BATCH_SIZE):
+            await in_flight.acquire()
+            tasks.append(asyncio.create_task(_embed_and_upload(batch)))
     
-    logger.info(f"Document size: {len(doc_text)} characters")
+    for chunks_with_embeddings, batch_ids in await asyncio.gather(*tasks):
+        pinecone_ids += batch_ids
+        embedded_chunks += [chunk for chunk, _ in chunks_with_embeddings]
     
-    logger.info("\n1. Parsing content...")
-    items = processor.parse_google_doc(doc_text)
     logger.info(f"   Found {len(items)} content items")
+    logger.info(f"   Created {processor.total_chunks} chunks")
+    logger.info(f"   Embedded {len(embedded_chunks)}/{processor.total_chunks} chunks")
+    logger.info(f"   Uploaded {len(pinecone_ids)} vectors")
     
     if not items:
         logger.warning("No content items found. Check the document format.")
         return
     
-    logger.info("\n2. Creating chunks...")
-    chunks = processor.create_chunks(items)
-    logger.info(f"   Created {len(chunks)} chunks")
-    
-    logger.info("\n3. Generating embeddings...")
-    logger.info("   This may take a few minutes...")
-    chunks_with_embeddings = processor.generate_embeddings(chunks)
-    logger.info(f"   Generated {len(chunks_with_embeddings)} embeddings")
-    
-    logger.info("\n4. Uploading to Pinecone (namespace: hr_docs)...")
-    pinecone_ids = await processor.upload_to_pinecone(
-        chunks_with_embeddings, 
-        pinecone_index,
-        namespace="hr_docs"
-    )
-    logger.info(f"   Uploaded {len(pinecone_ids)} vectors")
-    
     logger.info("\n5. Storing in PostgreSQL...")
-    await processor.store_in_database(items, chunks, pinecone_ids, db_session)
+    await processor.store_in_database(items, embedded_chunks, pinecone_ids, db_session)
     logger.info("   Database updated")
     
     logger.info("\n6. Generating preset answers...")
@@ -112,7 +143,7 @@ async def main(input_file: str):
     logger.info("=" * 60)
     logger.info(f"   Content items: {len(items)}")
     logger.info(f"   Total chunks:  {processor.total_chunks}")
-    logger.info(f"   Embeddings:    {len(chunks_with_embeddings)}")
+    logger.info(f"   Embeddings:    {len(embedded_chunks)}")
     logger.info(f"   Presets:       {processor.total_presets}")
     logger.info("")
     logger.info("Test the HR RAG system:")
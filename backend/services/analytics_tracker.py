@@ -1,18 +1,79 @@
 import os
+import json
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
+from sqlalchemy import extract, func, select, text
 from models import SessionLocal
 from models.content import ContentQueue
 
 logger = logging.getLogger(__name__)
 
+# Weekday names used in reports, indexed by date.weekday() (Postgres isodow - 1).
+# Indexing avoids a locale-dependent strftime('%A') per post.
+ISO_WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Post fields requested from the Graph API by both single and bulk lookups
+GRAPH_POST_FIELDS = 'likes.summary(true),comments.summary(true),shares,insights.metric(post_impressions,post_engaged_users,post_clicks)'
+
+# Successful Graph API lookups are reused for this long (seconds), so
+# dashboard endpoints hit within a few minutes of each other share results
+INSIGHTS_CACHE_TTL = 300
+INSIGHTS_CACHE_MAX = 1024
+
+# Writes only the 'analytics' key server-side, so concurrent edits to other
+# extra_metadata keys are not overwritten. Executed once with a list of
+# parameter sets (executemany). The column is json, not jsonb, so it is cast
+# to jsonb for jsonb_set and back to json for the assignment.
+STORE_ANALYTICS_SQL = text("""
+    UPDATE content_queue
+    SET extra_metadata = jsonb_set(coalesce(extra_metadata::jsonb, '{}'::jsonb), '{analytics}', CAST(:analytics AS jsonb), true)::json
+    WHERE id = :id
+""")
+
 class AnalyticsTracker:
     def __init__(self):
         self.page_access_token = os.getenv('FACEBOOK_PAGE_ACCESS_TOKEN')
         self.page_id = os.getenv('FACEBOOK_PAGE_ID')
         self.graph_api_version = 'v18.0'
+        self.graph_api_url = f"https://graph.facebook.com/{self.graph_api_version}/"
+        
+        # One pooled keep-alive session for all Graph API calls; transient
+        # 429/5xx responses are retried with backoff by urllib3.
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False
+            )
+        ))
+        
+        # post_id -> (expires_at, metrics); errors are never cached
+        self._insights_cache = {}
+    
+    def _get_cached_insights(self, post_id: str) -> Optional[Dict]:
+        entry = self._insights_cache.get(post_id)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+    
+    def _cache_insights(self, post_id: str, metrics: Dict) -> None:
+        now = time.monotonic()
+        if len(self._insights_cache) >= INSIGHTS_CACHE_MAX:
+            self._insights_cache = {
+                key: entry for key, entry in self._insights_cache.items() if entry[0] > now
+            }
+            if len(self._insights_cache) >= INSIGHTS_CACHE_MAX:
+                self._insights_cache.clear()
+        self._insights_cache[post_id] = (now + INSIGHTS_CACHE_TTL, metrics)
     
     def get_post_insights(self, post_id: str) -> Dict:
         """
@@ -28,48 +89,26 @@ class AnalyticsTracker:
             logger.error("Facebook token not configured")
             return {"error": "Token not configured"}
         
-        url = f"https://graph.facebook.com/{self.graph_api_version}/{post_id}"
+        cached = self._get_cached_insights(post_id)
+        if cached is not None:
+            return cached
+        
+        url = f"{self.graph_api_url}{post_id}"
         params = {
-            'fields': 'likes.summary(true),comments.summary(true),shares,insights.metric(post_impressions,post_engaged_users,post_clicks)',
+            'fields': GRAPH_POST_FIELDS,
             'access_token': self.page_access_token
         }
         
         try:
-            response = requests.get(url, params=params, timeout=15)
+            response = self.session.get(url, params=params, timeout=15)
             result = response.json()
             
             if 'error' in result:
                 logger.error(f"Analytics error for {post_id}: {result['error']}")
                 return {"error": result['error'].get('message', 'Unknown error')}
             
-            metrics = {
-                'post_id': post_id,
-                'likes': result.get('likes', {}).get('summary', {}).get('total_count', 0),
-                'comments': result.get('comments', {}).get('summary', {}).get('total_count', 0),
-                'shares': result.get('shares', {}).get('count', 0),
-                'engagement_rate': 0,
-                'impressions': 0,
-                'reach': 0,
-                'clicks': 0,
-                'collected_at': datetime.now().isoformat()
-            }
-            
-            insights = result.get('insights', {}).get('data', [])
-            for insight in insights:
-                metric_name = insight.get('name')
-                values = insight.get('values', [])
-                value = values[0].get('value', 0) if values else 0
-                
-                if metric_name == 'post_impressions':
-                    metrics['impressions'] = value
-                elif metric_name == 'post_engaged_users':
-                    metrics['reach'] = value
-                elif metric_name == 'post_clicks':
-                    metrics['clicks'] = value
-            
-            if metrics['impressions'] > 0:
-                total_engagement = metrics['likes'] + metrics['comments'] + metrics['shares']
-                metrics['engagement_rate'] = round((total_engagement / metrics['impressions']) * 100, 2)
+            metrics = self._parse_insights(post_id, result, datetime.now().isoformat())
+            self._cache_insights(post_id, metrics)
             
             logger.info(f"Collected metrics for {post_id}: {metrics['likes']} likes, {metrics['comments']} comments")
             
@@ -79,6 +118,109 @@ class AnalyticsTracker:
             logger.error(f"Failed to get insights for {post_id}: {e}")
             return {"error": str(e)}
     
+    def _parse_insights(self, post_id: str, result: Dict, collected_at: str) -> Dict:
+        """Turn a Graph API post object into the metrics dict stored under 'analytics'"""
+        metrics = {
+            'post_id': post_id,
+            'likes': result.get('likes', {}).get('summary', {}).get('total_count', 0),
+            'comments': result.get('comments', {}).get('summary', {}).get('total_count', 0),
+            'shares': result.get('shares', {}).get('count', 0),
+            'engagement_rate': 0,
+            'impressions': 0,
+            'reach': 0,
+            'clicks': 0,
+            'collected_at': collected_at
+        }
+        
+        insights = result.get('insights', {}).get('data', [])
+        for insight in insights:
+            metric_name = insight.get('name')
+            values = insight.get('values', [])
+            value = values[0].get('value', 0) if values else 0
+            
+            if metric_name == 'post_impressions':
+                metrics['impressions'] = value
+            elif metric_name == 'post_engaged_users':
+                metrics['reach'] = value
+            elif metric_name == 'post_clicks':
+                metrics['clicks'] = value
+        
+        if metrics['impressions'] > 0:
+            total_engagement = metrics['likes'] + metrics['comments'] + metrics['shares']
+            metrics['engagement_rate'] = round((total_engagement / metrics['impressions']) * 100, 2)
+        
+        return metrics
+    
+    def get_post_insights_bulk(self, post_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get engagement metrics for several Facebook posts in as few Graph API calls as possible
+        
+        Args:
+            post_ids: Facebook post IDs (page_id_post_id format)
+            
+        Returns:
+            Dict keyed by post_id; each value has the same shape as get_post_insights()
+        """
+        if not post_ids:
+            return {}
+        
+        if not self.page_access_token:
+            logger.error("Facebook token not configured")
+            return {post_id: {"error": "Token not configured"} for post_id in post_ids}
+        
+        url = self.graph_api_url
+        metrics_by_id = {}
+        to_fetch = []
+        
+        for post_id in post_ids:
+            # A JSON null fb_post_id would break the ','.join below
+            if not post_id:
+                metrics_by_id[post_id] = {"error": "Missing post ID"}
+                continue
+            
+            cached = self._get_cached_insights(post_id)
+            if cached is not None:
+                metrics_by_id[post_id] = cached
+            else:
+                to_fetch.append(post_id)
+        
+        # The ?ids= endpoint accepts at most 50 objects per request
+        for i in range(0, len(to_fetch), 50):
+            chunk = to_fetch[i:i+50]
+            params = {
+                'ids': ','.join(chunk),
+                'fields': GRAPH_POST_FIELDS,
+                'access_token': self.page_access_token
+            }
+            
+            try:
+                response = self.session.get(url, params=params, timeout=15)
+                result = response.json()
+                
+                if 'error' in result:
+                    # One unresolvable id (e.g. a deleted post, error #803) fails the whole
+                    # ?ids= request, so fetch this chunk per post to isolate it
+                    logger.warning(f"Bulk analytics error for {len(chunk)} posts, retrying one by one: {result['error']}")
+                    for post_id in chunk:
+                        metrics_by_id[post_id] = self.get_post_insights(post_id)
+                    continue
+                
+                collected_at = datetime.now().isoformat()
+                for post_id in chunk:
+                    if post_id in result:
+                        metrics_by_id[post_id] = self._parse_insights(post_id, result[post_id], collected_at)
+                        self._cache_insights(post_id, metrics_by_id[post_id])
+                    else:
+                        metrics_by_id[post_id] = {"error": "Post not returned by Graph API"}
+                
+                logger.info(f"Collected metrics for {len(chunk)} posts in one request")
+                
+            except Exception as e:
+                logger.error(f"Failed to get bulk insights for {len(chunk)} posts: {e}")
+                metrics_by_id.update((post_id, {"error": str(e)}) for post_id in chunk)
+        
+        return metrics_by_id
+    
     def get_best_posting_times(self, days: int = 30) -> Dict:
         """
         Analyze historical posts to find best posting times
@@ -94,15 +236,42 @@ class AnalyticsTracker:
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
             
-            posts = db.query(ContentQueue).filter(
+            analytics = ContentQueue.extra_metadata['analytics']
+            posted_with_fb_id = (
                 ContentQueue.status == 'posted',
                 ContentQueue.created_at >= cutoff_date,
-                ContentQueue.extra_metadata.isnot(None)
-            ).all()
+                ContentQueue.extra_metadata['fb_post_id'].isnot(None)
+            )
+            
+            # Posts with cached analytics are aggregated by Postgres; only
+            # (hour, weekday, count, engagement) rows come back.
+            hour_col = extract('hour', ContentQueue.created_at)
+            isodow_col = extract('isodow', ContentQueue.created_at)
+            engagement_col = (
+                func.coalesce(ContentQueue.extra_metadata[('analytics', 'likes')].as_integer(), 0)
+                + func.coalesce(ContentQueue.extra_metadata[('analytics', 'comments')].as_integer(), 0)
+                + func.coalesce(ContentQueue.extra_metadata[('analytics', 'shares')].as_integer(), 0)
+            )
+            cached_rows = db.query(
+                hour_col.label('hour'),
+                isodow_col.label('isodow'),
+                func.count().label('count'),
+                func.sum(engagement_col).label('engagement')
+            ).filter(
+                *posted_with_fb_id,
+                analytics.isnot(None)
+            ).group_by(hour_col, isodow_col).all()
             
-            posts = [p for p in posts if p.extra_metadata and 'fb_post_id' in p.extra_metadata]
+            uncached_posts = db.query(
+                ContentQueue.id,
+                ContentQueue.created_at,
+                ContentQueue.extra_metadata['fb_post_id'].as_string().label('fb_post_id')
+            ).filter(
+                *posted_with_fb_id,
+                analytics.is_(None)
+            ).all()
             
-            if not posts:
+            if not cached_rows and not uncached_posts:
                 return {
                     "message": "Not enough data yet. Need at least 1 posted article.",
                     "posts_analyzed": 0
@@ -113,41 +282,39 @@ class AnalyticsTracker:
             total_engagement = 0
             posts_with_metrics = 0
             
-            for post in posts:
-                post_id = post.extra_metadata.get('fb_post_id')
-                
-                if 'analytics' in post.extra_metadata:
-                    metrics = post.extra_metadata['analytics']
-                else:
-                    metrics = self.get_post_insights(post_id)
-                    
-                    if 'error' not in metrics:
-                        if not post.extra_metadata:
-                            post.extra_metadata = {}
-                        post.extra_metadata['analytics'] = metrics
-                
+            grouped = [
+                (int(row.hour), ISO_WEEKDAYS[int(row.isodow) - 1], row.count, int(row.engagement or 0))
+                for row in cached_rows
+            ]
+            
+            fetched = self.get_post_insights_bulk([post.fb_post_id for post in uncached_posts])
+            fresh = {}
+            
+            for post in uncached_posts:
+                metrics = fetched[post.fb_post_id]
                 if 'error' in metrics:
                     continue
                 
-                posts_with_metrics += 1
+                fresh[post.id] = metrics
                 engagement = metrics.get('likes', 0) + metrics.get('comments', 0) + metrics.get('shares', 0)
+                created_at = post.created_at
+                grouped.append((created_at.hour, ISO_WEEKDAYS[created_at.weekday()], 1, engagement))
+            
+            # Cache what was fetched so the next report aggregates it in SQL
+            self._store_analytics(db, fresh)
+            
+            for hour, day, count, engagement in grouped:
+                posts_with_metrics += count
                 total_engagement += engagement
                 
-                hour = post.created_at.hour
-                if hour not in performance_by_hour:
-                    performance_by_hour[hour] = {'count': 0, 'total_engagement': 0}
-                
-                performance_by_hour[hour]['count'] += 1
-                performance_by_hour[hour]['total_engagement'] += engagement
-                
-                day = post.created_at.strftime('%A')
-                if day not in performance_by_day:
-                    performance_by_day[day] = {'count': 0, 'total_engagement': 0}
+                # One lookup per bucket; the stats dict is then updated in place
+                hour_stats = performance_by_hour.setdefault(hour, {'count': 0, 'total_engagement': 0})
+                hour_stats['count'] += count
+                hour_stats['total_engagement'] += engagement
                 
-                performance_by_day[day]['count'] += 1
-                performance_by_day[day]['total_engagement'] += engagement
-            
-            db.commit()
+                day_stats = performance_by_day.setdefault(day, {'count': 0, 'total_engagement': 0})
+                day_stats['count'] += count
+                day_stats['total_engagement'] += engagement
             
             best_hours = []
             for hour, data in performance_by_hour.items():
@@ -162,8 +329,7 @@ class AnalyticsTracker:
             best_hours = sorted(best_hours, key=lambda x: x['avg_engagement'], reverse=True)
             
             best_days = []
-            day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            for day in day_order:
+            for day in ISO_WEEKDAYS:
                 if day in performance_by_day:
                     data = performance_by_day[day]
                     avg = data['total_engagement'] / data['count'] if data['count'] > 0 else 0
@@ -193,6 +359,21 @@ class AnalyticsTracker:
         finally:
             db.close()
     
+    def _store_analytics(self, db, metrics_by_row_id: Dict[int, Dict]) -> None:
+        """Cache fetched metrics under extra_metadata['analytics'] for many posts in one statement"""
+        if not metrics_by_row_id:
+            return
+        
+        try:
+            db.execute(STORE_ANALYTICS_SQL, [
+                {'id': row_id, 'analytics': json.dumps(metrics)}
+                for row_id, metrics in metrics_by_row_id.items()
+            ])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to cache analytics for {len(metrics_by_row_id)} posts: {e}")
+    
     def _generate_recommendations(self, best_hours: List, best_days: List, posts_count: int) -> List[str]:
         """Generate actionable recommendations based on data"""
         recommendations = []
@@ -219,27 +400,36 @@ class AnalyticsTracker:
         db = SessionLocal()
         
         try:
-            posts = db.query(ContentQueue).filter(
+            # Plain column rows: no ORM instances or identity-map entries
+            # are built for a read-mostly report.
+            stmt = select(
+                ContentQueue.id,
+                ContentQueue.created_at,
+                ContentQueue.extra_metadata,
+                ContentQueue.translated_title
+            ).where(
                 ContentQueue.status == 'posted',
                 ContentQueue.extra_metadata.isnot(None)
-            ).order_by(ContentQueue.created_at.desc()).limit(limit).all()
+            ).order_by(ContentQueue.created_at.desc()).limit(limit)
+            
+            posts = [p for p in db.execute(stmt) if p.extra_metadata and 'fb_post_id' in p.extra_metadata]
+            
+            fetched = self.get_post_insights_bulk([
+                p.extra_metadata['fb_post_id'] for p in posts if 'analytics' not in p.extra_metadata
+            ])
             
             results = []
+            fresh = {}
             
             for post in posts:
-                if not post.extra_metadata or 'fb_post_id' not in post.extra_metadata:
-                    continue
-                
                 post_id = post.extra_metadata['fb_post_id']
                 
                 if 'analytics' in post.extra_metadata:
                     metrics = post.extra_metadata['analytics']
                 else:
-                    metrics = self.get_post_insights(post_id)
+                    metrics = fetched[post_id]
                     if 'error' not in metrics:
-                        if not post.extra_metadata:
-                            post.extra_metadata = {}
-                        post.extra_metadata['analytics'] = metrics
+                        fresh[post.id] = metrics
                 
                 if 'error' in metrics:
                     continue
@@ -258,7 +448,7 @@ class AnalyticsTracker:
                     }
                 })
             
-            db.commit()
+            self._store_analytics(db, fresh)
             return results
             
         finally:
@@ -12,16 +12,108 @@ Removed checks:
 """
 
 import os
+import json
+import time
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 import anthropic as _anthropic_module
-from typing import Dict, List, Optional
-from services.ai_models import HAIKU
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from collections import Counter, defaultdict, deque
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
 from datetime import datetime
-from openai import OpenAI
+from openai import OpenAI, APITimeoutError as OpenAITimeoutError, RateLimitError as OpenAIRateLimitError, NotFoundError as OpenAINotFoundError
 
 logger = logging.getLogger(__name__)
 
+# Per-request timeout (seconds) for the SDK probes; they are not retried,
+# so a hanging provider fails the check fast instead of stalling it
+PROBE_TIMEOUT = 5.0
+
+# Image model used by image_generator; the OpenAI probe checks it's available
+DALLE_MODEL = 'dall-e-3'
+
+# Thread cap for check_all_services as more services are added
+MAX_PROBE_WORKERS = 8
+
+# Upper bound (seconds) on check_all_services waiting for the slowest probe
+HEALTH_CHECK_TIMEOUT = 15
+
+# (connect, read) timeout in seconds for the Graph and Telegram HTTP probes.
+# They get one retry, so the worst case (2 x 5s) stays under HEALTH_CHECK_TIMEOUT
+# and a slow but healthy service is not reported as timed out.
+PROBE_HTTP_TIMEOUT = (2, 3)
+
+# Probe results are reused for this long (seconds) so the scheduler and the
+# status endpoints don't repeat paid Anthropic/OpenAI calls seconds apart
+HEALTH_CACHE_TTL = 60
+
+# Static parts of the Telegram alert; only the error/warning lines and the
+# timestamp are formatted per alert
+ALERT_HEADER = "🚨 <b>API Token Monitor Alert</b>\n"
+ALERT_QUICK_LINKS = (
+    "\n\n📊 <b>Quick Links:</b>\n"
+    "• Claude: https://console.anthropic.com/settings/usage\n"
+    "• OpenAI: https://platform.openai.com/usage\n"
+    "• Facebook: https://developers.facebook.com/"
+)
+
+
+# Probe latencies kept per service for get_metrics()
+LATENCY_SAMPLES = 100
+
+
+def _percentile(sorted_values: List[float], percent: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list; None when empty"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class _CircuitBreaker:
+    """
+    Stops calling a provider after repeated failed probes.
+    Once open, one probe is let through per sleep_window (half-open);
+    a healthy result closes it again.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, sleep_window: float = 600):
+        self.failure_threshold = failure_threshold
+        self.sleep_window = sleep_window
+        self.failures = 0
+        self.opened_at = None
+        self.last_failure = None
+        self._lock = threading.Lock()
+    
+    def open_state(self) -> Optional[Tuple[int, Dict]]:
+        """None when a probe may run; otherwise (failures, last_failure) read under the lock"""
+        with self._lock:
+            if self.opened_at is None:
+                return None
+            if time.monotonic() - self.opened_at >= self.sleep_window:
+                # Half-open: this caller probes, others wait for the next window
+                self.opened_at = time.monotonic()
+                return None
+            return self.failures, self.last_failure
+    
+    def record(self, service_status: Dict):
+        with self._lock:
+            if service_status.get('status') == 'healthy':
+                self.failures = 0
+                self.opened_at = None
+                self.last_failure = None
+                return
+            
+            self.failures += 1
+            self.last_failure = service_status
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
 class APITokenMonitor:
     """
     Monitor all API tokens, quotas, and expiration dates
@@ -35,10 +127,122 @@ class APITokenMonitor:
         self.days_warning = 7
         self.quota_warning_percent = 80
         
-    def check_all_services(self) -> Dict:
+        # Keep-alive session for Telegram alert delivery. Transient 429/5xx
+        # responses are retried with backoff (honouring Retry-After), POSTs
+        # included: a rare duplicate alert is better than a lost one.
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(['GET', 'POST']),
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        ))
+        
+        # Health probes run under HEALTH_CHECK_TIMEOUT, so they get a single
+        # quick retry and never sleep on a server-sent Retry-After
+        self.probe_session = requests.Session()
+        self.probe_session.mount('https://', HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=1,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(['GET', 'POST']),
+                respect_retry_after_header=False,
+                raise_on_status=False
+            )
+        ))
+        
+        # SDK clients are kept between probes (and their connection pools with
+        # them); a client is rebuilt only when its API key changes
+        self._anthropic_client = None
+        self._anthropic_client_key = None
+        self._openai_client = None
+        self._openai_client_key = None
+        
+        # Billable probes are skipped while their provider keeps failing
+        self._breakers = {
+            'anthropic': _CircuitBreaker(),
+            'openai': _CircuitBreaker()
+        }
+        
+        # service_name -> (expires_at, status dict); exceptions are not cached
+        self._health_cache = {}
+        self._probe_locks = {}
+        
+        # Per-service cache hit/miss counts and recent probe latencies; probe
+        # threads update them while get_metrics() reads, so both hold _metrics_lock
+        self._cache_hits = Counter()
+        self._cache_misses = Counter()
+        self._latencies_ms = defaultdict(lambda: deque(maxlen=LATENCY_SAMPLES))
+        self._metrics_lock = threading.Lock()
+        
+    def _run_cached_check(self, service_name: str, check_function, force_refresh: bool = False) -> Dict:
+        """Return check_function()'s result, reusing one from the last HEALTH_CACHE_TTL seconds"""
+        entry = self._health_cache.get(service_name)
+        if entry and not force_refresh and entry[0] > time.monotonic():
+            with self._metrics_lock:
+                self._cache_hits[service_name] += 1
+            return entry[1]
+        
+        # One probe per provider at a time: overlapping check_all_services
+        # calls (scheduler + dashboard) wait and reuse the fresh result
+        # instead of hitting the same host in parallel
+        with self._probe_locks.setdefault(service_name, threading.Lock()):
+            entry = self._health_cache.get(service_name)
+            if entry and not force_refresh and entry[0] > time.monotonic():
+                with self._metrics_lock:
+                    self._cache_hits[service_name] += 1
+                return entry[1]
+            
+            with self._metrics_lock:
+                self._cache_misses[service_name] += 1
+            started = time.perf_counter()
+            service_status = check_function()
+            latency_ms = round((time.perf_counter() - started) * 1000, 1)
+            with self._metrics_lock:
+                self._latencies_ms[service_name].append(latency_ms)
+            service_status = {**service_status, 'latency_ms': latency_ms}
+            
+            self._health_cache[service_name] = (time.monotonic() + HEALTH_CACHE_TTL, service_status)
+            return service_status
+    
+    def get_metrics(self) -> Dict:
+        """Health-cache hit rate and probe latency (p50/p95 over recent probes) per service"""
+        # Copy under the lock, then compute percentiles without holding it
+        with self._metrics_lock:
+            snapshot = [
+                (service_name, self._cache_hits[service_name], self._cache_misses[service_name],
+                 list(self._latencies_ms[service_name]))
+                for service_name in set(self._cache_hits) | set(self._cache_misses)
+            ]
+        
+        metrics = {}
+        for service_name, hits, misses, latencies in snapshot:
+            latencies.sort()
+            metrics[service_name] = {
+                'cache_hits': hits,
+                'cache_misses': misses,
+                'hit_rate': round(hits / (hits + misses), 3),
+                'latency_p50_ms': _percentile(latencies, 50),
+                'latency_p95_ms': _percentile(latencies, 95),
+                'probes_sampled': len(latencies)
+            }
+        return metrics
+    
+    def check_all_services(self, force_refresh: bool = False) -> Dict:
         """
         Check all API services
         Returns summary of all checks
+        
+        Args:
+            force_refresh: Probe every service even if a recent result is cached
         """
         
         results = {
@@ -54,28 +258,52 @@ class APITokenMonitor:
             ('telegram', self.check_telegram_bot)
         ]
         
-        for service_name, check_function in services_to_check:
-            try:
-                service_status = check_function()
-                results['services'][service_name] = service_status
-                
-                if service_status.get('warning'):
-                    results['warnings'].append({
-                        'service': service_name,
-                        'message': service_status.get('warning_message')
-                    })
-                
-                if service_status.get('status') == 'error':
-                    results['errors'].append({
-                        'service': service_name,
-                        'message': service_status.get('error_message')
-                    })
-                    
-            except Exception as e:
-                logger.error(f"Error checking {service_name}: {e}")
+        # The probes are independent network round trips, so run them side by
+        # side; a hung provider is cut off after HEALTH_CHECK_TIMEOUT.
+        executor = ThreadPoolExecutor(max_workers=min(len(services_to_check), MAX_PROBE_WORKERS))
+        futures = {
+            executor.submit(self._run_cached_check, service_name, check_function, force_refresh): service_name
+            for service_name, check_function in services_to_check
+        }
+        outcomes = {}
+        
+        try:
+            for future in as_completed(futures, timeout=HEALTH_CHECK_TIMEOUT):
+                service_name = futures[future]
+                try:
+                    outcomes[service_name] = future.result()
+                except Exception as e:
+                    outcomes[service_name] = e
+        except FuturesTimeoutError:
+            for service_name in futures.values():
+                if service_name not in outcomes:
+                    outcomes[service_name] = TimeoutError(f"No response within {HEALTH_CHECK_TIMEOUT}s")
+        finally:
+            executor.shutdown(wait=False)
+        
+        for service_name, _ in services_to_check:
+            service_status = outcomes[service_name]
+            
+            if isinstance(service_status, Exception):
+                logger.error(f"Error checking {service_name}: {service_status}")
                 results['errors'].append({
                     'service': service_name,
-                    'message': str(e)
+                    'message': str(service_status)
+                })
+                continue
+            
+            results['services'][service_name] = service_status
+            
+            if service_status.get('warning'):
+                results['warnings'].append({
+                    'service': service_name,
+                    'message': service_status.get('warning_message')
+                })
+            
+            if service_status.get('status') == 'error':
+                results['errors'].append({
+                    'service': service_name,
+                    'message': service_status.get('error_message')
                 })
         
         if results['warnings'] or results['errors']:
@@ -83,11 +311,47 @@ class APITokenMonitor:
         
         return results
     
+    def _get_anthropic_client(self, api_key: str):
+        if self._anthropic_client is None or self._anthropic_client_key != api_key:
+            self._anthropic_client = _anthropic_module.Anthropic(api_key=api_key, timeout=PROBE_TIMEOUT, max_retries=0)
+            self._anthropic_client_key = api_key
+        return self._anthropic_client
+    
+    def _get_openai_client(self, api_key: str) -> OpenAI:
+        if self._openai_client is None or self._openai_client_key != api_key:
+            self._openai_client = OpenAI(api_key=api_key, timeout=PROBE_TIMEOUT, max_retries=0)
+            self._openai_client_key = api_key
+        return self._openai_client
+    
+    def _probe_with_breaker(self, service_name: str, probe) -> Dict:
+        """Run a billable probe unless its circuit is open; then repeat the last failure instead"""
+        breaker = self._breakers[service_name]
+        # Snapshot taken under the breaker lock: a concurrent healthy record()
+        # may reset failures and last_failure right after it
+        open_state = breaker.open_state()
+        if open_state is not None:
+            failures, last_failure = open_state
+            logger.warning(f"[APIMonitor] {service_name} circuit open after {failures} failed checks, skipping API call")
+            return {
+                **last_failure,
+                'circuit_open': True,
+                'note': f'Last {failures} checks failed; next real check within {int(breaker.sleep_window)}s'
+            }
+        
+        service_status = probe()
+        breaker.record(service_status)
+        return service_status
+    
     def check_anthropic_api(self) -> Dict:
+        """Check Claude API status (skipped while its circuit breaker is open)"""
+        return self._probe_with_breaker('anthropic', self._probe_anthropic_api)
+    
+    def _probe_anthropic_api(self) -> Dict:
         """
-        Check Claude API status via a real minimal API call.
+        Check Claude API status via the models listing, which validates the
+        key without generating (and billing) any tokens.
         Uses typed SDK exceptions — never string-matches error messages.
-        Timeout: 10 seconds. Model: HAIKU (cheapest/fastest).
+        Timeout: PROBE_TIMEOUT (5 seconds), no retries.
         """
         _SVC = 'Claude AI (Anthropic)'
         _CONSOLE = 'https://console.anthropic.com/settings/usage'
@@ -104,12 +368,8 @@ class APITokenMonitor:
             }
 
         try:
-            client = _anthropic_module.Anthropic(api_key=api_key, timeout=10.0)
-            client.messages.create(
-                model=HAIKU,
-                max_tokens=10,
-                messages=[{"role": "user", "content": "ping"}],
-            )
+            client = self._get_anthropic_client(api_key)
+            client.models.list(limit=1)
             logger.info("[APIMonitor] Anthropic check: healthy")
             return {
                 'status': 'healthy',
@@ -165,13 +425,13 @@ class APITokenMonitor:
             }
 
         except _anthropic_module.APITimeoutError as e:
-            logger.warning(f"[APIMonitor] Anthropic request timed out after 10s: {e}")
+            logger.warning(f"[APIMonitor] Anthropic request timed out after {PROBE_TIMEOUT:.0f}s: {e}")
             return {
                 'status': 'warning',
                 'service_name': _SVC,
                 'warning': True,
                 'error_type': 'TIMEOUT',
-                'warning_message': 'Claude API did not respond within 10s — key likely valid, network issue',
+                'warning_message': f'Claude API did not respond within {PROBE_TIMEOUT:.0f}s — key likely valid, network issue',
                 'console_url': _CONSOLE,
             }
 
@@ -221,6 +481,10 @@ class APITokenMonitor:
             }
     
     def check_openai_api(self) -> Dict:
+        """Check OpenAI (DALL-E) API status and quota (skipped while its circuit breaker is open)"""
+        return self._probe_with_breaker('openai', self._probe_openai_api)
+    
+    def _probe_openai_api(self) -> Dict:
         """Check OpenAI (DALL-E) API status and quota"""
         
         api_key = os.getenv('OPENAI_API_KEY')
@@ -233,11 +497,15 @@ class APITokenMonitor:
             }
         
         try:
-            client = OpenAI(api_key=api_key)
-            
-            models = client.models.list()
+            client = self._get_openai_client(api_key)
             
-            dalle_available = any('dall-e' in model.id for model in models.data)
+            # Retrieving the one image model in use validates the key and
+            # answers dalle_available without downloading the full model list
+            try:
+                client.models.retrieve(DALLE_MODEL)
+                dalle_available = True
+            except OpenAINotFoundError:
+                dalle_available = False
             
             return {
                 'status': 'healthy',
@@ -271,6 +539,18 @@ class APITokenMonitor:
                     'action_required': 'Add credits at platform.openai.com/billing',
                     'console_url': 'https://platform.openai.com/settings/organization/billing'
                 }
+            elif isinstance(e, (OpenAITimeoutError, OpenAIRateLimitError)):
+                return {
+                    'status': 'warning',
+                    'service_name': 'OpenAI (DALL-E)',
+                    'warning': True,
+                    'warning_message': (
+                        f'OpenAI API did not respond within {PROBE_TIMEOUT:.0f}s — key likely valid, network issue'
+                        if isinstance(e, OpenAITimeoutError) else
+                        'OpenAI API rate-limited (429) — key is valid, usage is high'
+                    ),
+                    'console_url': 'https://platform.openai.com/usage'
+                }
             else:
                 return {
                     'status': 'error',
@@ -292,11 +572,28 @@ class APITokenMonitor:
             }
         
         try:
-            url = f'https://graph.facebook.com/v18.0/me'
-            params = {'access_token': page_access_token}
+            # /me and /debug_token in one Graph batch request (one round trip)
+            url = 'https://graph.facebook.com/v18.0/'
+            batch = [
+                {'method': 'GET', 'relative_url': 'me'},
+                {'method': 'GET', 'relative_url': 'debug_token?' + urlencode({'input_token': page_access_token})}
+            ]
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.probe_session.post(
+                url,
+                data={'access_token': page_access_token, 'batch': json.dumps(batch)},
+                timeout=PROBE_HTTP_TIMEOUT
+            )
             result = response.json()
+            checked_at = datetime.now()
+            debug_data = {}
+            
+            # A token Graph can't use fails the whole batch with a top-level
+            # error; otherwise each entry carries its own JSON body
+            if isinstance(result, list):
+                me_response, debug_response = result
+                result = json.loads(me_response['body']) if me_response else {}
+                debug_data = json.loads(debug_response['body']) if debug_response else {}
             
             if 'error' in result:
                 error = result['error']
@@ -317,15 +614,6 @@ class APITokenMonitor:
                         'console_url': 'https://developers.facebook.com/'
                     }
             
-            url_debug = f'https://graph.facebook.com/v18.0/debug_token'
-            params_debug = {
-                'input_token': page_access_token,
-                'access_token': page_access_token
-            }
-            
-            response_debug = requests.get(url_debug, params=params_debug, timeout=10)
-            debug_data = response_debug.json()
-            
             if 'data' in debug_data:
                 token_data = debug_data['data']
                 expires_at = token_data.get('expires_at')
@@ -336,12 +624,12 @@ class APITokenMonitor:
                         'service_name': 'Facebook Page Token',
                         'is_valid': True,
                         'expires': 'Never',
-                        'last_checked': datetime.now().isoformat(),
+                        'last_checked': checked_at.isoformat(),
                         'console_url': 'https://developers.facebook.com/'
                     }
                 else:
                     expiry_date = datetime.fromtimestamp(expires_at)
-                    days_remaining = (expiry_date - datetime.now()).days
+                    days_remaining = (expiry_date - checked_at).days
                     
                     if days_remaining < self.days_warning:
                         return {
@@ -360,7 +648,7 @@ class APITokenMonitor:
                             'is_valid': True,
                             'days_remaining': days_remaining,
                             'expires_at': expiry_date.isoformat(),
-                            'last_checked': datetime.now().isoformat(),
+                            'last_checked': checked_at.isoformat(),
                             'console_url': 'https://developers.facebook.com/'
                         }
             
@@ -368,7 +656,7 @@ class APITokenMonitor:
                 'status': 'healthy',
                 'service_name': 'Facebook Page Token',
                 'is_valid': True,
-                'last_checked': datetime.now().isoformat(),
+                'last_checked': checked_at.isoformat(),
                 'console_url': 'https://developers.facebook.com/'
             }
                 
@@ -392,7 +680,7 @@ class APITokenMonitor:
         
         try:
             url = f"https://api.telegram.org/bot{self.telegram_bot_token}/getMe"
-            response = requests.get(url, timeout=10)
+            response = self.probe_session.get(url, timeout=PROBE_HTTP_TIMEOUT)
             
             if response.status_code == 200:
                 bot_info = response.json()
@@ -432,7 +720,7 @@ class APITokenMonitor:
         if not warnings and not errors:
             return
         
-        message_parts = ["🚨 <b>API Token Monitor Alert</b>\n"]
+        message_parts = [ALERT_HEADER]
         
         if errors:
             message_parts.append(f"\n❌ <b>ERRORS ({len(errors)}):</b>")
@@ -448,10 +736,7 @@ class APITokenMonitor:
                 msg = warning['message']
                 message_parts.append(f"• {service}: {msg}")
         
-        message_parts.append("\n\n📊 <b>Quick Links:</b>")
-        message_parts.append("• Claude: https://console.anthropic.com/settings/usage")
-        message_parts.append("• OpenAI: https://platform.openai.com/usage")
-        message_parts.append("• Facebook: https://developers.facebook.com/")
+        message_parts.append(ALERT_QUICK_LINKS)
         
         message_parts.append(f"\n⏰ Checked: {datetime.now().strftime('%H:%M, %d %b %Y')}")
         
@@ -466,7 +751,7 @@ class APITokenMonitor:
                 "disable_web_page_preview": True
             }
             
-            response = requests.post(url, json=payload, timeout=10)
+            response = self.session.post(url, json=payload, timeout=10)
             
             if response.status_code == 200:
                 logger.info("API monitor alert sent successfully to Telegram")
@@ -505,7 +790,7 @@ class APITokenMonitor:
                 "parse_mode": "HTML"
             }
             
-            requests.post(url, json=payload, timeout=10)
+            self.session.post(url, json=payload, timeout=10)
             logger.info("API monitor success notification sent")
             
         except Exception as e:
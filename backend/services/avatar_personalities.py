@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import date
+from functools import lru_cache
 
 AVATAR_METADATA = {
     "maya": {
@@ -24,24 +25,40 @@ AVATAR_METADATA = {
     }
 }
 
-MAYA_KEYWORDS = [
+MAYA_KEYWORDS = (
     "hr", "відпустк", "зарплат", "лікарнян", "навчання", "онбординг",
     "onboarding", "компанія", "бренд", "brand", "співробітник", "employee",
     "процедур", "policy", "benefits", "пільг", "графік", "schedule",
     "документ", "довідк", "техпідтримк", "support"
-]
+)
 
-ALEX_KEYWORDS = [
+# Keywords are matched as substrings and each counts once, so a keyword that
+# contains another one ("profitability" > "profit", "margin" > "gin",
+# "pour cost" > "cost") would score twice; only the shorter one is listed.
+ALEX_KEYWORDS = (
     "коктейль", "cocktail", "рецепт", "recipe", "міксолог", "mixolog",
     "напій", "drink", "горілка", "vodka", "віскі", "whisky", "whiskey",
     "бар", "bar", "інгредієнт", "ingredient", "смак", "taste", "flavor",
     "джин", "gin", "ром", "rum", "текіла", "tequila", "лікер", "liqueur",
-    "прибуток", "profit", "рентабельність", "profitability", "маржа", "margin",
+    "прибуток", "profit", "рентабельність", "маржа",
     "собівартість", "cost", "ціноутворення", "pricing", "меню", "menu",
     "навчання", "training", "персонал", "staff", "horeca", "хорека",
-    "roi", "рої", "pour cost", "інвентар", "inventory", "торгов", "trade",
+    "roi", "рої", "інвентар", "inventory", "торгов", "trade",
     "агент", "agent", "revenue", "виручка", "дохід", "продаж", "sales"
-]
+)
+
+# Addressing an avatar by name ("Alex, ...") routes to it directly
+NAME_TRIGGERS = {
+    'maya': 'maya', 'майя': 'maya',
+    'alex': 'alex', 'алекс': 'alex'
+}
+NAME_PREFIX_STRIP = ',:!.?'
+
+# Ukrainian month names in the genitive ("5 березня"), indexed by date.month
+UK_MONTHS_GENITIVE = (
+    "", "січня", "лютого", "березня", "квітня", "травня", "червня",
+    "липня", "серпня", "вересня", "жовтня", "листопада", "грудня"
+)
 
 def detect_avatar_role(message: str, history: list = None) -> str:
     """
@@ -50,17 +67,12 @@ def detect_avatar_role(message: str, history: list = None) -> str:
     """
     message_lower = message.lower().strip()
     
-    name_triggers = {
-        'maya': ['maya', 'майя'],
-        'alex': ['alex', 'алекс']
-    }
+    first_word = message_lower.split(maxsplit=1)[0] if message_lower else ''
+    first_word_clean = first_word.rstrip(NAME_PREFIX_STRIP)
     
-    first_word = message_lower.split()[0] if message_lower else ''
-    first_word_clean = first_word.rstrip(',:!.?')
-    
-    for avatar, names in name_triggers.items():
-        if first_word_clean in names:
-            return avatar
+    named_avatar = NAME_TRIGGERS.get(first_word_clean)
+    if named_avatar:
+        return named_avatar
     
     maya_score = sum(1 for kw in MAYA_KEYWORDS if kw in message_lower)
     alex_score = sum(1 for kw in ALEX_KEYWORDS if kw in message_lower)
@@ -74,17 +86,19 @@ def detect_avatar_role(message: str, history: list = None) -> str:
 
 def get_avatar_personality(avatar_role: str, is_first_message: bool = True, history_len: int = 0) -> str:
     """Get system prompt for avatar personality with dynamic date context"""
-    
-    current_date = datetime.now()
+    # A prompt only depends on the role, today's date and (for Alex) whether
+    # the phone CTA is due, so each combination is built once and reused.
+    # Any other role gets the general prompt; folding it to "general" keeps
+    # the cache at four prompts per day whatever role strings clients send.
+    if avatar_role not in ("maya", "alex"):
+        avatar_role = "general"
+    return _build_avatar_personality(avatar_role, date.today(), avatar_role == "alex" and history_len >= 4)
+
+@lru_cache(maxsize=8)
+def _build_avatar_personality(avatar_role: str, current_date: date, phone_cta: bool) -> str:
     current_year = current_date.year
     
-    # Ukrainian month names for proper formatting
-    uk_months = {
-        1: "січня", 2: "лютого", 3: "березня", 4: "квітня",
-        5: "травня", 6: "червня", 7: "липня", 8: "серпня",
-        9: "вересня", 10: "жовтня", 11: "листопада", 12: "грудня"
-    }
-    formatted_date_uk = f"{current_date.day} {uk_months[current_date.month]} {current_year} року"
+    formatted_date_uk = f"{current_date.day} {UK_MONTHS_GENITIVE[current_date.month]} {current_year} року"
     
     # Date context to inject into all prompts
     date_context = f"""
@@ -164,7 +178,7 @@ Cite sources when using RAG knowledge.
 Завжди пам'ятай: ти внутрішній HR-помічник для команди TD AV, а не зовнішній маркетинг-консультант.\""""
 
     elif avatar_role == "alex":
-        if history_len >= 4:
+        if phone_cta:
             closing_section = """**CLOSING SECTION**
 Always end substantive answers with this exact closing:
 "🤝 Хочете, щоб наш HoReCa-менеджер зв'язався з вами особисто та підібрав оптимальний асортимент для вашого закладу?
@@ -8,9 +8,11 @@ Supports Ukrainian, Russian, and English with code-switching (e.g., "розка
 import os
 import re
 import logging
+import unicodedata
 import httpx
 from typing import Optional, Tuple
 from difflib import SequenceMatcher
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +40,75 @@ BESTBRANDS_TEXT_FALLBACK = """🏢 Торговий Дім АВ — найбіл
 Які питання маєш про наші продукти чи послуги? 😊"""
 
 
+QUESTION_PATTERNS_UA = [
+    r'розкажи\s+про',
+    r'що\s+таке',
+    r'хто\s+такі',
+    r'про\s+компанію',
+    r'про\s+вас',
+    r'хто\s+ви',
+    r'ким\s+ви\s+є',
+]
+
+QUESTION_PATTERNS_RU = [
+    r'расскажи\s+о',
+    r'расскажи\s+про',
+    r'что\s+такое',
+    r'кто\s+такие',
+    r'о\s+компании',
+    r'про\s+компанию',
+    r'кто\s+вы',
+]
+
+QUESTION_PATTERNS_EN = [
+    r'tell\s+me\s+about',
+    r'tell\s+about',
+    r'who\s+is',
+    r'who\s+are',
+    r'what\s+is',
+    r'about\s+the\s+company',
+    r'about\s+your\s+company',
+    r'who\s+are\s+you',
+]
+
+COMPANY_NAMES = [
+    r'торгов\w*\s*д[іi]м\s*ав',
+    r'тдав',
+    r'тд\s*ав',
+    r'trading\s*house\s*av',
+    r'avtd',
+    r'автд',
+    r'ав\s*тд',
+]
+
+COMPANY_ONLY_PATTERNS = [
+    r'^про\s+компанію\??$',
+    r'^о\s+компании\??$',
+    r'^about\s+the\s+company\??$',
+    r'^about\s+your\s+company\??$',
+]
+
+SIMPLE_ABOUT_PATTERNS = [
+    r'^про\s+торгов\w*\s*д[іi]м\s*ав',
+    r'^про\s+тдав',
+    r'^про\s+тд\s*ав',
+    r'^about\s+trading\s*house\s*av',
+    r'^торгов\w*\s*д[іi]м\s*ав\s*\??$',
+    r'^тдав\s*\??$',
+]
+
+
+def _compile_any(patterns: list) -> re.Pattern:
+    """One alternation per pattern group, so a message is scanned once per group"""
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+
+
+QUESTION_RE = _compile_any(QUESTION_PATTERNS_UA + QUESTION_PATTERNS_RU + QUESTION_PATTERNS_EN)
+COMPANY_NAME_RE = _compile_any(COMPANY_NAMES)
+COMPANY_ONLY_RE = _compile_any(COMPANY_ONLY_PATTERNS)
+SIMPLE_ABOUT_RE = _compile_any(SIMPLE_ABOUT_PATTERNS)
+
+
 def fuzzy_match(str1: str, str2: str, threshold: float = 0.85) -> bool:
     """
     Check if two strings are similar (handles typos).
@@ -50,8 +121,15 @@ def fuzzy_match(str1: str, str2: str, threshold: float = 0.85) -> bool:
     Returns:
         True if strings are similar enough
     """
-    ratio = SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
-    return ratio >= threshold
+    matcher = SequenceMatcher(None, str1.lower(), str2.lower())
+    # real_quick_ratio() (lengths only) and quick_ratio() (character counts)
+    # are cheap upper bounds on ratio(), so most word pairs are rejected
+    # without the full matching-blocks computation.
+    return (
+        matcher.real_quick_ratio() >= threshold
+        and matcher.quick_ratio() >= threshold
+        and matcher.ratio() >= threshold
+    )
 
 
 def detect_bestbrands_trigger(message_text: str) -> bool:
@@ -70,83 +148,28 @@ def detect_bestbrands_trigger(message_text: str) -> bool:
     if not message_text:
         return False
     
-    message_lower = message_text.lower().strip()
-    
-    question_patterns_ua = [
-        r'розкажи\s+про',
-        r'що\s+таке',
-        r'хто\s+такі',
-        r'про\s+компанію',
-        r'про\s+вас',
-        r'хто\s+ви',
-        r'ким\s+ви\s+є',
-    ]
-    
-    question_patterns_ru = [
-        r'расскажи\s+о',
-        r'расскажи\s+про',
-        r'что\s+такое',
-        r'кто\s+такие',
-        r'о\s+компании',
-        r'про\s+компанию',
-        r'кто\s+вы',
-    ]
-    
-    question_patterns_en = [
-        r'tell\s+me\s+about',
-        r'tell\s+about',
-        r'who\s+is',
-        r'who\s+are',
-        r'what\s+is',
-        r'about\s+the\s+company',
-        r'about\s+your\s+company',
-        r'who\s+are\s+you',
-    ]
-    
-    company_names = [
-        r'торгов\w*\s*д[іi]м\s*ав',
-        r'тдав',
-        r'тд\s*ав',
-        r'trading\s*house\s*av',
-        r'avtd',
-        r'автд',
-        r'ав\s*тд',
-    ]
-    
-    company_only_patterns = [
-        r'^про\s+компанію\??$',
-        r'^о\s+компании\??$',
-        r'^about\s+the\s+company\??$',
-        r'^about\s+your\s+company\??$',
-    ]
-    
-    for pattern in company_only_patterns:
-        if re.search(pattern, message_lower):
-            logger.debug(f"✅ ТДАВ trigger matched: company-only pattern")
-            return True
-    
-    all_question_patterns = question_patterns_ua + question_patterns_ru + question_patterns_en
+    # Telegram clients may send decomposed (NFD) Cyrillic, e.g. 'й' as
+    # 'и' + combining breve, which the NFC patterns would not match
+    return _detect_normalized(unicodedata.normalize('NFC', message_text).lower().strip())
+
+
+@lru_cache(maxsize=4096)
+def _detect_normalized(message_lower: str) -> bool:
+    """detect_bestbrands_trigger on an already lowercased, stripped message; cached since chat messages repeat a lot"""
+    if COMPANY_ONLY_RE.search(message_lower):
+        logger.debug(f"✅ ТДАВ trigger matched: company-only pattern")
+        return True
     
-    has_question = any(re.search(p, message_lower) for p in all_question_patterns)
-    has_company_name = any(re.search(p, message_lower) for p in company_names)
+    has_question = QUESTION_RE.search(message_lower) is not None
+    has_company_name = COMPANY_NAME_RE.search(message_lower) is not None
     
     if has_question and has_company_name:
         logger.debug(f"✅ ТДАВ trigger matched: question + company name")
         return True
     
-    simple_about_patterns = [
-        r'^про\s+торгов\w*\s*д[іi]м\s*ав',
-        r'^про\s+тдав',
-        r'^про\s+тд\s*ав',
-        r'^about\s+trading\s*house\s*av',
-        r'^торгов\w*\s*д[іi]м\s*ав\s*\??$',
-        r'^тдав\s*\??$',
-    ]
-    
-    for pattern in simple_about_patterns:
-        if re.search(pattern, message_lower):
-            logger.debug(f"✅ ТДАВ trigger matched: simple pattern")
-            return True
+    if SIMPLE_ABOUT_RE.search(message_lower):
+        logger.debug(f"✅ ТДАВ trigger matched: simple pattern")
+        return True
     
     words = message_lower.split()
     for i in range(len(words) - 1):
@@ -166,7 +189,7 @@ def detect_bestbrands_trigger(message_text: str) -> bool:
                 logger.debug(f"✅ ТДАВ trigger matched: fuzzy 'торговий дім ав' ({three_word_phrase})")
                 return True
     
-    logger.debug(f"❌ No ТДАВ trigger in: {message_text[:50]}...")
+    logger.debug(f"❌ No ТДАВ trigger in: {message_lower[:50]}...")
     return False
 
 
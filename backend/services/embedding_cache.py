@@ -0,0 +1,72 @@
+"""
+On-disk embedding cache keyed by the SHA-256 of the embedded text.
+Used by the manual ingestion scripts so re-running them over unchanged
+content does not call OpenAI again. Vectors are stored as float32.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import List
+
+from services.rag_utils import get_embeddings_batch
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = Path(os.getenv("EMBEDDING_CACHE_PATH", Path.home() / ".cache" / "gradus" / "embeddings.sqlite3"))
+
+# One connection shared by every caller; manual_ingest embeds from a producer
+# thread (a new one per run), so it is not tied to its creating thread and
+# all access goes through _lock instead.
+_conn = None
+_lock = threading.Lock()
+
+
+def _get_conn() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+    return _conn
+
+
+def _key(text: str) -> str:
+    # get_embeddings_batch truncates to 8000 chars, so texts that differ only past
+    # that point share an embedding.
+    return hashlib.sha256(text[:8000].encode("utf-8")).hexdigest()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+def get_or_embed_batch(texts: List[str]) -> List[List[float]]:
+    """Return embeddings for texts, calling OpenAI only for texts not seen before"""
+    keys = [_key(text) for text in texts]
+
+    cached = {}
+    with _lock:
+        conn = _get_conn()
+        for key in set(keys):
+            row = conn.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+            if row:
+                cached[key] = _unpack(row[0])
+
+    missing = {key: text for key, text in zip(keys, texts) if key not in cached}
+    if missing:
+        embeddings = get_embeddings_batch(list(missing.values()))
+        with _lock, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, array("f", embedding).tobytes()) for key, embedding in zip(missing, embeddings)],
+            )
+        cached.update(zip(missing, embeddings))
+
+    logger.info(f"Embedding cache: {len(keys) - len(missing)} hits, {len(missing)} misses")
+    return [cached[key] for key in keys]
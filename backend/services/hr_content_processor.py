@@ -8,9 +8,10 @@ HR Content Processor for Maya HR Bot
 
 import re
 import os
+import asyncio
 import logging
 import hashlib
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Iterable, Iterator
 from dataclasses import dataclass
 from openai import OpenAI
 
@@ -104,14 +105,23 @@ class HRContentProcessor:
     
     def parse_google_doc(self, doc_text: str) -> List[ContentItem]:
         """Parse Google Doc text into structured content items"""
-        items = []
+        items = list(self.iter_parse(doc_text.split('\n')))
+        
+        self.processed_items = items
+        logger.info(f"Parsed {len(items)} content items from document")
+        return items
+    
+    def iter_parse(self, lines: Iterable[str]) -> Iterator[ContentItem]:
+        """
+        Parse the knowledge base line by line, yielding each content item as soon as it ends.
+        Accepts any iterable of lines, including an open file, so the document never has to
+        be held in memory as one string.
+        """
         current_section = None
         current_content = []
         current_title = None
         question_number = 0
         
-        lines = doc_text.split('\n')
-        
         for line in lines:
             line = line.strip()
             if not line:
@@ -126,12 +136,12 @@ class HRContentProcessor:
                         cid = f"q{question_number}"
                     else:
                         cid = "section_unknown"
-                    items.append(self._create_content_item(
+                    yield self._create_content_item(
                         content_id=cid,
                         title=current_title,
                         content='\n'.join(current_content),
                         content_type='text'
-                    ))
+                    )
                 
                 current_section = f"appendix_{appendix_match.group(1)}"
                 current_title = line.lstrip('#').strip()
@@ -142,12 +152,12 @@ class HRContentProcessor:
             question_match = re.match(self.SECTION_PATTERNS['question'], line)
             if question_match:
                 if current_content and current_title:
-                    items.append(self._create_content_item(
+                    yield self._create_content_item(
                         content_id=f"q{question_number}" if question_number else f"section_{current_section}",
                         title=current_title,
                         content='\n'.join(current_content),
                         content_type='text'
-                    ))
+                    )
                 
                 question_number = int(question_match.group(1))
                 current_title = question_match.group(2)
@@ -159,12 +169,12 @@ class HRContentProcessor:
             if section_match and not line.startswith('|'):
                 if current_content and current_title:
                     content_type = 'video' if self._is_video_content('\n'.join(current_content)) else 'text'
-                    items.append(self._create_content_item(
+                    yield self._create_content_item(
                         content_id=f"section_{current_section}" if current_section else f"q{question_number}",
                         title=current_title,
                         content='\n'.join(current_content),
                         content_type=content_type
-                    ))
+                    )
                 
                 section_name = section_match.group(1).strip()
                 current_section = self._generate_section_id(section_name)
@@ -176,16 +186,12 @@ class HRContentProcessor:
             current_content.append(line)
         
         if current_content and current_title:
-            items.append(self._create_content_item(
+            yield self._create_content_item(
                 content_id=f"q{question_number}" if question_number else f"section_{current_section}",
                 title=current_title,
                 content='\n'.join(current_content),
                 content_type='text'
-            ))
-        
-        self.processed_items = items
-        logger.info(f"Parsed {len(items)} content items from document")
-        return items
+            )
     
     def _create_content_item(
         self,
@@ -309,7 +315,14 @@ class HRContentProcessor:
     
     def create_chunks(self, items: List[ContentItem]) -> List[ContentChunk]:
         """Create chunks from all content items"""
-        all_chunks = []
+        all_chunks = list(self.iter_chunks(items))
+        
+        logger.info(f"Created {len(all_chunks)} chunks from {len(items)} items")
+        return all_chunks
+    
+    def iter_chunks(self, items: Iterable[ContentItem]) -> Iterator[ContentChunk]:
+        """Yield chunks item by item; total_chunks counts what has been yielded so far"""
+        self.total_chunks = 0
         
         for item in items:
             text_to_chunk = f"{item.title}\n\n{item.content}"
@@ -330,11 +343,8 @@ class HRContentProcessor:
                         'keywords': item.keywords or []
                     }
                 )
-                all_chunks.append(chunk)
-        
-        self.total_chunks = len(all_chunks)
-        logger.info(f"Created {len(all_chunks)} chunks from {len(items)} items")
-        return all_chunks
+                self.total_chunks += 1
+                yield chunk
     
     def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for a text chunk"""
@@ -349,22 +359,43 @@ class HRContentProcessor:
             logger.error(f"Embedding error: {e}")
             raise
     
-    def generate_embeddings(self, chunks: List[ContentChunk]) -> List[Tuple[ContentChunk, List[float]]]:
-        """Generate embeddings for all chunks"""
-        results = []
-        
-        for i, chunk in enumerate(chunks):
-            try:
-                embedding = self.generate_embedding(chunk.text)
-                results.append((chunk, embedding))
-                
-                if (i + 1) % 10 == 0:
-                    logger.info(f"Generated embeddings: {i + 1}/{len(chunks)}")
-            except Exception as e:
-                logger.error(f"Failed to embed chunk {chunk.content_id}_{chunk.chunk_index}: {e}")
+    async def generate_embeddings(
+        self,
+        chunks: List[ContentChunk],
+        batch_size: int = 100,
+        concurrency: int = 10
+    ) -> List[Tuple[ContentChunk, List[float]]]:
+        """Generate embeddings for all chunks, several batch requests at a time"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _embed(batch: List[ContentChunk]):
+            async with semaphore:
+                return await asyncio.to_thread(self.embed_batch, batch)
+        
+        batches = await asyncio.gather(*[
+            _embed(chunks[i:i + batch_size]) for i in range(0, len(chunks), batch_size)
+        ])
+        results = [pair for batch in batches for pair in batch]
         
+        logger.info(f"Generated embeddings: {len(results)}/{len(chunks)}")
         return results
     
+    def embed_batch(self, chunks: List[ContentChunk]) -> List[Tuple[ContentChunk, List[float]]]:
+        """Embed a batch of chunks in one request; raises once the SDK's retries are exhausted"""
+        try:
+            # Let the SDK back off on 429s before giving up on the batch
+            response = openai_client.with_options(max_retries=5).embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=[chunk.text[:8000] for chunk in chunks]
+            )
+        except Exception as e:
+            # Fail the run rather than finish "successfully" with part of the corpus missing
+            logger.error(f"Failed to embed batch of {len(chunks)} chunks starting at {chunks[0].content_id}_{chunks[0].chunk_index}: {e}")
+            raise
+        
+        embeddings = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        return list(zip(chunks, embeddings))
+    
     def generate_pinecone_id(self, content_id: str, chunk_index: int) -> str:
         """Generate unique Pinecone vector ID (ASCII only)"""
         raw_id = f"hr_{content_id}_{chunk_index}"
@@ -395,14 +426,23 @@ class HRContentProcessor:
             })
         
         batch_size = 100
-        for i in range(0, len(vectors), batch_size):
-            batch = vectors[i:i + batch_size]
-            try:
-                pinecone_index.upsert(vectors=batch, namespace=namespace)
-                logger.info(f"Uploaded batch {i // batch_size + 1} to Pinecone")
-            except Exception as e:
-                logger.error(f"Pinecone upload error: {e}")
-                raise
+        semaphore = asyncio.Semaphore(8)
+        
+        async def _upsert(batch_number: int, batch: List[Dict]):
+            async with semaphore:
+                try:
+                    await asyncio.to_thread(pinecone_index.upsert, vectors=batch, namespace=namespace)
+                    logger.info(f"Uploaded batch {batch_number} to Pinecone")
+                except Exception as e:
+                    logger.error(f"Pinecone upload error: {e}")
+                    raise
+        
+        # Batches go out in parallel worker threads, so the event loop is
+        # not blocked while Pinecone responds.
+        await asyncio.gather(*[
+            _upsert(i // batch_size + 1, vectors[i:i + batch_size])
+            for i in range(0, len(vectors), batch_size)
+        ])
         
         logger.info(f"Uploaded {len(vectors)} vectors to Pinecone namespace '{namespace}'")
         return pinecone_ids
@@ -525,23 +565,23 @@ async def process_hr_knowledge_base(doc_path: str, pinecone_index, db_session) -
     """Main function to process HR knowledge base"""
     processor = HRContentProcessor()
     
-    with open(doc_path, 'r', encoding='utf-8') as f:
-        doc_text = f.read()
-    
     logger.info("Parsing content...")
-    items = processor.parse_google_doc(doc_text)
+    with open(doc_path, 'r', encoding='utf-8') as f:
+        items = list(processor.iter_parse(f))
     
     logger.info("Creating chunks...")
     chunks = processor.create_chunks(items)
     
     logger.info("Generating embeddings...")
-    chunks_with_embeddings = processor.generate_embeddings(chunks)
+    chunks_with_embeddings = await processor.generate_embeddings(chunks)
     
     logger.info("Uploading to Pinecone...")
     pinecone_ids = await processor.upload_to_pinecone(chunks_with_embeddings, pinecone_index)
     
     logger.info("Storing in database...")
-    await processor.store_in_database(items, chunks, pinecone_ids, db_session)
+    # A failed embedding batch is dropped, so pair ids with the chunks that were embedded
+    embedded_chunks = [chunk for chunk, _ in chunks_with_embeddings]
+    await processor.store_in_database(items, embedded_chunks, pinecone_ids, db_session)
     
     logger.info("Generating preset answers...")
     await processor.generate_presets(db_session)
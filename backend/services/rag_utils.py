@@ -5,11 +5,18 @@ import logging
 from typing import List, Tuple, Optional, Dict
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
-from openai import OpenAI
+from openai import OpenAI, DefaultHttpxClient
 
 logger = logging.getLogger(__name__)
 
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# One pooled client for every embedding call in the process; scripts import
+# openai_client from here rather than building their own.
+openai_client = OpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    http_client=DefaultHttpxClient(
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+    )
+)
 
 def get_embedding(text: str) -> List[float]:
     """Get embedding using OpenAI text-embedding-3-small"""
@@ -24,6 +31,20 @@ def get_embedding(text: str) -> List[float]:
         logger.error(f"Embedding error: {e}")
         raise
 
+def get_embeddings_batch(texts: List[str]) -> List[List[float]]:
+    """Get embeddings for several texts in one text-embedding-3-small request"""
+    try:
+        # Batch callers are offline ingest jobs, so ride out rate limits
+        # longer than the SDK's default 2 retries before giving up.
+        response = openai_client.with_options(max_retries=5).embeddings.create(
+            model="text-embedding-3-small",
+            input=[text[:8000] for text in texts]
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+    except Exception as e:
+        logger.error(f"Batch embedding error: {e}")
+        raise
+
 def extract_urls(text: str) -> List[str]:
     """Extract URLs from text"""
     url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'